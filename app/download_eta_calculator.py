@@ -1,50 +1,102 @@
+"""Progress, speed and ETA helpers for download jobs.
+
+This module is kept fully annotated so it can be compiled with mypyc; see the README.
+"""
 from __future__ import annotations
 
 import math
 import time
 from collections import deque
+from functools import lru_cache
 from typing import Deque, Dict, Optional
 
 
+class _SampleWindow:
+    """Fixed-size window of samples that keeps a running sum for O(1) averages.
+
+    Subtracting evicted samples lets rounding error build up in the running sum,
+    so it is recomputed exactly once per full turnover of the window (amortized O(1)).
+    """
+
+    def __init__(self, size: int) -> None:
+        self._samples: Deque[float] = deque(maxlen=size)
+        self._sum: float = 0.0
+        self._evictions = 0
+
+    def append(self, value: float) -> None:
+        if len(self._samples) == self._samples.maxlen:
+            self._sum -= self._samples[0]
+            self._evictions += 1
+        self._samples.append(value)
+        if self._evictions >= len(self._samples):
+            self._sum = math.fsum(self._samples)
+            self._evictions = 0
+        else:
+            self._sum += value
+
+    def clear(self) -> None:
+        self._samples.clear()
+        self._sum = 0.0
+        self._evictions = 0
+
+    def mean(self) -> float:
+        n = len(self._samples)
+        return self._sum / n if n else 0.0
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+
 class AdvancedETACalculator:
-    def __init__(self, window_size: int = 10) -> None:
+    def __init__(self, window_size: int = 10, min_emit_interval: float = 0.25) -> None:
         self.window_size = window_size
-        self.speed_samples: Deque[float] = deque(maxlen=window_size)
-        self.start_time: Optional[float] = None
-        self.last_update_time: Optional[float] = None
+        self.speed_samples = _SampleWindow(window_size)
+        # Monotonic nanosecond timestamps; converted to seconds only when building results.
+        self.start_time_ns: Optional[int] = None
+        self.last_update_time_ns: Optional[int] = None
         self.last_downloaded_units: float = 0.0
         self.total_units: float = 0.0
+        # Updates closer together than this are flagged should_emit=False so callers can skip pushing them.
+        self._min_emit_interval_ns = int(min_emit_interval * 1_000_000_000)
+        self._last_emit_ns: Optional[int] = None
 
     def start(self, total_units: float) -> None:
-        now = time.time()
-        self.start_time = now
-        self.last_update_time = now
+        now_ns = time.monotonic_ns()
+        self.start_time_ns = now_ns
+        self.last_update_time_ns = now_ns
         self.total_units = float(total_units)
         self.last_downloaded_units = 0.0
         self.speed_samples.clear()
+        self._last_emit_ns = None
 
     def update(self, downloaded_units: float) -> Dict[str, object]:
-        now = time.time()
-        if self.start_time is None or self.last_update_time is None:
-            return self._result(downloaded_units, 0.0, None, None)
+        now_ns = time.monotonic_ns()
+        if self.start_time_ns is None or self.last_update_time_ns is None:
+            return self._result(downloaded_units, 0.0, None, None, self._should_emit(now_ns))
 
-        dt = now - self.last_update_time
+        dt_ns = now_ns - self.last_update_time_ns
         du = float(downloaded_units) - self.last_downloaded_units
 
-        if dt > 0 and du >= 0:
-            speed = du / dt
+        if dt_ns > 0 and du >= 0:
+            speed = du * 1_000_000_000 / dt_ns
             if speed > 0:
                 self.speed_samples.append(speed)
 
-        self.last_update_time = now
+        self.last_update_time_ns = now_ns
         self.last_downloaded_units = float(downloaded_units)
 
-        avg_speed = sum(self.speed_samples) / len(self.speed_samples) if self.speed_samples else 0.0
+        avg_speed = self.speed_samples.mean()
         remaining = max(0.0, self.total_units - float(downloaded_units))
         eta_seconds = (remaining / avg_speed) if avg_speed > 0 else None
-        elapsed = now - self.start_time
+        elapsed = (now_ns - self.start_time_ns) / 1_000_000_000
 
-        return self._result(downloaded_units, avg_speed, eta_seconds, elapsed)
+        return self._result(downloaded_units, avg_speed, eta_seconds, elapsed, self._should_emit(now_ns))
+
+    def _should_emit(self, now_ns: int) -> bool:
+        if self._last_emit_ns is not None and now_ns - self._last_emit_ns < self._min_emit_interval_ns:
+            return False
+        self._last_emit_ns = now_ns
+        return True
 
     def _result(
         self,
@@ -52,6 +104,7 @@ class AdvancedETACalculator:
         speed_units_per_s: float,
         eta_seconds: Optional[float],
         elapsed_seconds: Optional[float],
+        should_emit: bool = True,
     ) -> Dict[str, object]:
         progress = (float(downloaded_units) / self.total_units * 100.0) if self.total_units > 0 else 0.0
         return {
@@ -60,34 +113,38 @@ class AdvancedETACalculator:
             "speed_units_per_s": float(speed_units_per_s),
             "progress_percent": float(progress),
             "eta_seconds": eta_seconds,
-            "eta_formatted": self._format_time(eta_seconds),
+            "eta_formatted": self._format_seconds(eta_seconds),
             "elapsed_seconds": elapsed_seconds,
-            "elapsed_formatted": self._format_time(elapsed_seconds),
+            "elapsed_formatted": self._format_seconds(elapsed_seconds),
+            "should_emit": should_emit,
         }
 
     @staticmethod
-    def _format_time(seconds: Optional[float]) -> str:
+    def _format_seconds(seconds: Optional[float]) -> str:
         if seconds is None or seconds <= 0 or math.isnan(seconds) or math.isinf(seconds):
             return "Calculating..."
-        if seconds >= 3600:
-            h = int(seconds // 3600)
-            m = int((seconds % 3600) // 60)
-            return f"{h}h {m}m"
-        m = int(seconds // 60)
-        s = int(seconds % 60)
-        return f"{m:02d}:{s:02d}"
+        return _format_time(int(seconds))
+
+
+@lru_cache(maxsize=4096)
+def _format_time(seconds: int) -> str:
+    s = int(seconds)
+    if s >= 3600:
+        return f"{s // 3600}h {(s % 3600) // 60}m"
+    return f"{s // 60:02d}:{s % 60:02d}"
+
+
+_UNITS = ("B", "KB", "MB", "GB", "TB", "PB")
 
 
-def format_bytes(num_bytes: int) -> str:
-    v = float(max(0, num_bytes))
-    for unit in ["B", "KB", "MB", "GB", "TB"]:
-        if v < 1024.0:
-            return f"{v:.2f} {unit}"
-        v /= 1024.0
-    return f"{v:.2f} PB"
+def format_bytes(num_bytes: float) -> str:
+    n = max(0, int(num_bytes))
+    # Each unit step is 10 bits, so the unit index falls straight out of the bit length.
+    idx = min(5, max(0, (n.bit_length() - 1) // 10))
+    return f"{n / (1 << (idx * 10)):.2f} {_UNITS[idx]}"
 
 
 def format_speed(bps: float) -> str:
     if bps <= 0:
         return "0 B/s"
-    return f"{format_bytes(int(bps))}/s"
+    return f"{format_bytes(bps)}/s"
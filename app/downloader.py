@@ -17,12 +17,19 @@ import shutil
 from tqdm import tqdm
 from concurrent.futures import ThreadPoolExecutor, as_completed
 
+# Keep-alive connections per host; covers the parallel season fetches plus
+# token/source lookups running alongside them.
+HTTP_POOL_SIZE = 16
+
 class AnimeDownloader:
     def __init__(self, config: Dict[str, Any] = None):
         self.BASE_URL = "https://anikai.to"
         self.scraper = cloudscraper.create_scraper(
             browser={"browser": "chrome", "platform": "windows", "desktop": True}
         )
+        # Resize the existing adapters in place: remounting would drop cloudscraper's TLS cipher setup.
+        for adapter in self.scraper.adapters.values():
+            adapter.init_poolmanager(HTTP_POOL_SIZE, HTTP_POOL_SIZE)
         self.HEADERS = {
             "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36",
             "Referer": self.BASE_URL,
@@ -108,25 +115,29 @@ class AnimeDownloader:
         try:
             r = self.scraper.get(url, headers=self.HEADERS, timeout=30)
             r.raise_for_status()
-            soup = BeautifulSoup(r.text, "html.parser")
-
-            anime_div = soup.select_one("div[data-id]")
-            anime_id = anime_div.get("data-id") if anime_div else None
-
-            title_elem = (
-                soup.select_one("div.title-wrapper h1.title span")
-                or soup.select_one("h1.title")
-                or soup.select_one(".anime-title")
-            )
-            title = title_elem.get("title") if title_elem and title_elem.get("title") else (
-                title_elem.text.strip() if title_elem else "Unknown"
-            )
-            title = re.sub(r'[<>:"/\\|?*]', "", title)
-            return anime_id, title
+            return self.parse_anime_details(r.text)
         except Exception as e:
             self.log("ERROR", f"Error getting anime details: {e}")
             return None, "Unknown"
 
+    def parse_anime_details(self, html: str) -> Tuple[Optional[str], str]:
+        """Extract anime ID and title from an already fetched watch page"""
+        soup = BeautifulSoup(html, "html.parser")
+
+        anime_div = soup.select_one("div[data-id]")
+        anime_id = anime_div.get("data-id") if anime_div else None
+
+        title_elem = (
+            soup.select_one("div.title-wrapper h1.title span")
+            or soup.select_one("h1.title")
+            or soup.select_one(".anime-title")
+        )
+        title = title_elem.get("title") if title_elem and title_elem.get("title") else (
+            title_elem.text.strip() if title_elem else "Unknown"
+        )
+        title = re.sub(r'[<>:"/\\|?*]', "", title)
+        return anime_id, title
+
     def detect_season_from_title(self, title: str) -> int:
         """Auto-detect season number from title"""
         patterns = [
@@ -1,6 +1,9 @@
 """Application extensions initialized via init_app pattern."""
 from flask_socketio import SocketIO
 
+# "threading" is the only supported mode. Under eventlet/gevent, threading.local
+# becomes greenlet-local (breaking the per-thread SQLite connections in JobStore)
+# and blocking SQLite, yt-dlp and cloudscraper calls would stall the event hub.
 socketio = SocketIO(
     async_mode="threading",
     cors_allowed_origins="*",
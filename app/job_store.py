@@ -5,81 +5,272 @@ import json
 import os
 import sqlite3
 import threading
-from typing import Dict, Any, List
+from contextlib import contextmanager
+from typing import Dict, Any, Iterable, Iterator, List, Optional, Tuple, Union
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# JSON documents stored here always start with one of these bytes; anything
+# else is a MessagePack payload.
+_JSON_LEAD_BYTES = frozenset(b"{[")
+
+
+def _dumps(obj: Any) -> bytes:
+    """Serialize for a BLOB column: MessagePack when available, else compact UTF-8 JSON."""
+    if msgpack is not None:
+        return msgpack.packb(obj, use_bin_type=True)
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def _loads(data: Union[bytes, str]) -> Any:
+    # Rows written before the BLOB switch come back as str; both parsers accept either.
+    if isinstance(data, bytes) and data and data[0] not in _JSON_LEAD_BYTES:
+        if msgpack is None:
+            raise ValueError("MessagePack row found but msgpack is not installed")
+        return msgpack.unpackb(data, raw=False, strict_map_key=False)
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+# Statements are kept as module constants so every call passes the identical
+# string and sqlite3's per-connection statement cache reuses the prepared handle.
+_UPSERT_SQL = """
+INSERT INTO jobs(job_id, anime_url, config_json, state_json, start_time, status, updated_at)
+VALUES (?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+ON CONFLICT(job_id) DO UPDATE SET
+    anime_url=excluded.anime_url,
+    config_json=excluded.config_json,
+    state_json=excluded.state_json,
+    start_time=excluded.start_time,
+    status=excluded.status,
+    updated_at=CURRENT_TIMESTAMP
+"""
+_DELETE_SQL = "DELETE FROM jobs WHERE job_id = ?"
+_DELETE_CHUNK = 500
+_FINISHED_IDS_SQL = "SELECT job_id FROM jobs WHERE status IN ('completed', 'failed')"
+_DELETE_FINISHED_SQL = "DELETE FROM jobs WHERE status IN ('completed', 'failed')"
+_LOAD_SQL = "SELECT job_id, anime_url, config_json, state_json FROM jobs ORDER BY job_id ASC"
+_JSON_ROWS_SQL = (
+    "SELECT job_id, config_json, state_json FROM jobs "
+    "WHERE hex(substr(state_json, 1, 1)) IN ('7B', '5B') OR hex(substr(config_json, 1, 1)) IN ('7B', '5B')"
+)
+# PRAGMA user_version value meaning "no JSON-encoded rows remain"; below it,
+# _migrate_json_rows has to scan the table when msgpack is available.
+_USER_VERSION_MSGPACK_ONLY = 1
+_LOAD_ONE_SQL = "SELECT job_id, anime_url, config_json, state_json FROM jobs WHERE job_id = ?"
+_LOAD_RECENT_SQL = "SELECT job_id, anime_url, config_json, state_json FROM jobs ORDER BY job_id DESC LIMIT ?"
+_LOAD_PAGE_SQL = (
+    "SELECT job_id, anime_url, config_json, state_json FROM jobs "
+    "ORDER BY start_time DESC, job_id DESC LIMIT ? OFFSET ?"
+)
+
+
+def _row_to_job(r: sqlite3.Row) -> Dict[str, Any]:
+    return {
+        "job_id": int(r["job_id"]),
+        "anime_url": r["anime_url"],
+        "config": _loads(r["config_json"]),
+        "state": _loads(r["state_json"]),
+    }
 
 
 class JobStore:
     def __init__(self, db_path: str):
         self.db_path = db_path
-        self._lock = threading.Lock()
+        # One connection per thread; WAL lets readers run alongside the single writer.
+        self._local = threading.local()
+        self._write_lock = threading.Lock()
         self._init_db()
+        row = self._get_conn().execute("SELECT COALESCE(MAX(job_id), 0) AS max_id FROM jobs").fetchone()
+        # Highest job id seen; advanced under the write lock so readers never query for it.
+        self._max_id = int(row["max_id"]) if row else 0
+        self._sync_row_format()
+        self.checkpoint()
 
-    def _connect(self):
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
+    def _get_conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, isolation_level=None, cached_statements=128)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA temp_store=MEMORY")
+            conn.execute("PRAGMA cache_size=-64000")
+            conn.execute("PRAGMA mmap_size=268435456")
+            conn.execute("PRAGMA busy_timeout=5000")
+            # SQLite's auto-checkpoint keeps recycling the WAL; this caps the
+            # size it is left at afterwards, so no explicit checkpoint is needed per write.
+            conn.execute("PRAGMA journal_size_limit=4194304")
+            self._local.conn = conn
         return conn
 
+    @contextmanager
+    def _write(self) -> Iterator[sqlite3.Connection]:
+        conn = self._get_conn()
+        with self._write_lock:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+
     def _init_db(self):
         os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
-        with self._connect() as conn:
+        with self._write() as conn:
             conn.execute(
                 """
                 CREATE TABLE IF NOT EXISTS jobs (
                     job_id INTEGER PRIMARY KEY,
                     anime_url TEXT NOT NULL,
-                    config_json TEXT NOT NULL,
-                    state_json TEXT NOT NULL,
+                    config_json BLOB NOT NULL,
+                    state_json BLOB NOT NULL,
+                    start_time TEXT,
+                    status TEXT,
                     updated_at DATETIME DEFAULT CURRENT_TIMESTAMP
                 )
                 """
             )
-            conn.commit()
+            columns = {r["name"] for r in conn.execute("PRAGMA table_info(jobs)")}
+            if "start_time" not in columns:
+                conn.execute("ALTER TABLE jobs ADD COLUMN start_time TEXT")
+            if "status" not in columns:
+                conn.execute("ALTER TABLE jobs ADD COLUMN status TEXT")
+            # Backfill rows written before start_time/status had their own columns.
+            missing = conn.execute(
+                "SELECT job_id, state_json FROM jobs WHERE start_time IS NULL OR status IS NULL"
+            ).fetchall()
+            backfill = []
+            for r in missing:
+                try:
+                    state = _loads(r["state_json"])
+                except Exception:
+                    continue
+                backfill.append((state.get("start_time"), state.get("status"), r["job_id"]))
+            if backfill:
+                conn.executemany("UPDATE jobs SET start_time = ?, status = ? WHERE job_id = ?", backfill)
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_jobs_start_time ON jobs(start_time DESC, job_id DESC)"
+            )
+
+    def _sync_row_format(self) -> None:
+        """Migrate JSON rows once, tracking in ``PRAGMA user_version`` whether any can remain."""
+        version = self._get_conn().execute("PRAGMA user_version").fetchone()[0]
+        if msgpack is None:
+            # This process writes JSON, so a later msgpack install must migrate again.
+            if version >= _USER_VERSION_MSGPACK_ONLY:
+                with self._write() as conn:
+                    conn.execute(f"PRAGMA user_version = {_USER_VERSION_MSGPACK_ONLY - 1}")
+        elif version < _USER_VERSION_MSGPACK_ONLY:
+            self._migrate_json_rows()
+
+    def _migrate_json_rows(self) -> None:
+        """Re-encode rows still stored as JSON so every row uses the current format."""
+        with self._write() as conn:
+            conn.execute(f"PRAGMA user_version = {_USER_VERSION_MSGPACK_ONLY}")
+            rewrites = []
+            for r in conn.execute(_JSON_ROWS_SQL).fetchall():
+                try:
+                    rewrites.append((_dumps(_loads(r["config_json"])), _dumps(_loads(r["state_json"])), r["job_id"]))
+                except Exception:
+                    continue
+            if rewrites:
+                conn.executemany("UPDATE jobs SET config_json = ?, state_json = ? WHERE job_id = ?", rewrites)
 
     def upsert_job(self, job_id: int, anime_url: str, config: Dict[str, Any], state: Dict[str, Any]) -> None:
-        with self._lock:
-            with self._connect() as conn:
-                conn.execute(
-                    """
-                    INSERT INTO jobs(job_id, anime_url, config_json, state_json, updated_at)
-                    VALUES (?, ?, ?, ?, CURRENT_TIMESTAMP)
-                    ON CONFLICT(job_id) DO UPDATE SET
-                        anime_url=excluded.anime_url,
-                        config_json=excluded.config_json,
-                        state_json=excluded.state_json,
-                        updated_at=CURRENT_TIMESTAMP
-                    """,
-                    (job_id, anime_url, json.dumps(config, ensure_ascii=False), json.dumps(state, ensure_ascii=False)),
-                )
-                conn.commit()
+        self.upsert_jobs([(job_id, anime_url, config, state)])
+
+    def upsert_jobs(self, jobs: Iterable[Tuple[int, str, Dict[str, Any], Dict[str, Any]]]) -> None:
+        """Write several ``(job_id, anime_url, config, state)`` rows in one transaction."""
+        rows = [
+            (job_id, anime_url, _dumps(config), _dumps(state), state.get("start_time"), state.get("status"))
+            for job_id, anime_url, config, state in jobs
+        ]
+        if not rows:
+            return
+        with self._write() as conn:
+            conn.executemany(_UPSERT_SQL, rows)
+            self._max_id = max(self._max_id, max(row[0] for row in rows))
 
     def delete_job(self, job_id: int) -> None:
-        with self._lock:
-            with self._connect() as conn:
-                conn.execute("DELETE FROM jobs WHERE job_id = ?", (job_id,))
-                conn.commit()
-
-    def load_jobs(self) -> List[Dict[str, Any]]:
-        with self._lock:
-            with self._connect() as conn:
-                rows = conn.execute("SELECT job_id, anime_url, config_json, state_json FROM jobs ORDER BY job_id ASC").fetchall()
-
-        result = []
-        for r in rows:
+        with self._write() as conn:
+            conn.execute(_DELETE_SQL, (job_id,))
+
+    def delete_jobs_bulk(self, job_ids: Iterable[int]) -> int:
+        """Delete many jobs in one transaction; returns how many rows were removed."""
+        ids = list(job_ids)
+        if not ids:
+            return 0
+        deleted = 0
+        with self._write() as conn:
+            # Chunked to stay under SQLite's bound-parameter limit on older builds.
+            for start in range(0, len(ids), _DELETE_CHUNK):
+                chunk = ids[start:start + _DELETE_CHUNK]
+                placeholders = ",".join("?" * len(chunk))
+                deleted += conn.execute(f"DELETE FROM jobs WHERE job_id IN ({placeholders})", chunk).rowcount
+        return deleted
+
+    def delete_finished_jobs(self) -> List[int]:
+        """Delete every stored completed/failed job in one transaction; returns their ids."""
+        with self._write() as conn:
+            ids = [int(r["job_id"]) for r in conn.execute(_FINISHED_IDS_SQL)]
+            if ids:
+                conn.execute(_DELETE_FINISHED_SQL)
+        return ids
+
+    def checkpoint(self) -> None:
+        """Fold the WAL back into the main database file and truncate it.
+
+        Blocks writers while it runs, so it is only called at startup and shutdown.
+        """
+        with self._write_lock:
+            self._get_conn().execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
+    def load_jobs(self) -> Iterator[Dict[str, Any]]:
+        """Yield stored jobs in id order, parsing each row only as it is consumed.
+
+        Rows whose JSON cannot be decoded are skipped. Callers that need a
+        list should wrap the result in ``list()``.
+        """
+        return self._iter_rows(self._get_conn().execute(_LOAD_SQL))
+
+    def load_recent_jobs(self, limit: int) -> Iterator[Dict[str, Any]]:
+        """Yield up to ``limit`` stored jobs, newest id first."""
+        return self._iter_rows(self._get_conn().execute(_LOAD_RECENT_SQL, (limit,)))
+
+    def load_jobs_page(self, limit: int, offset: int = 0) -> Iterator[Dict[str, Any]]:
+        """Yield one page of stored jobs, newest start first, walking idx_jobs_start_time."""
+        return self._iter_rows(self._get_conn().execute(_LOAD_PAGE_SQL, (limit, offset)))
+
+    def load_job(self, job_id: int) -> Optional[Dict[str, Any]]:
+        """Return one stored job, or None if it is missing or unreadable."""
+        r = self._get_conn().execute(_LOAD_ONE_SQL, (job_id,)).fetchone()
+        if r is None:
+            return None
+        try:
+            return _row_to_job(r)
+        except Exception:
+            return None
+
+    @staticmethod
+    def _iter_rows(cursor: sqlite3.Cursor) -> Iterator[Dict[str, Any]]:
+        for r in cursor:
             try:
-                result.append(
-                    {
-                        "job_id": int(r["job_id"]),
-                        "anime_url": r["anime_url"],
-                        "config": json.loads(r["config_json"]),
-                        "state": json.loads(r["state_json"]),
-                    }
-                )
+                job = _row_to_job(r)
             except Exception:
                 continue
-        return result
+            yield job
 
     def get_max_job_id(self) -> int:
-        with self._lock:
-            with self._connect() as conn:
-                row = conn.execute("SELECT COALESCE(MAX(job_id), 0) AS max_id FROM jobs").fetchone()
-        return int(row["max_id"]) if row else 0
+        return self._max_id
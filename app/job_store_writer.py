@@ -0,0 +1,129 @@
+"""Coalescing background writer for job state persistence."""
+from __future__ import annotations
+
+import logging
+import threading
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from app.job_store import JobStore
+
+logger = logging.getLogger(__name__)
+
+# (anime_url, config, state, state_version)
+_PendingJob = Tuple[str, Dict[str, Any], Dict[str, Any], int]
+_JobRow = Tuple[int, str, Dict[str, Any], Dict[str, Any], int]
+
+
+class BufferedJobWriter:
+    """Buffers job upserts and writes only the latest state per job.
+
+    Pending rows are flushed by a daemon thread every ``interval`` seconds in a
+    single transaction. ``flush_now`` writes synchronously, e.g. on terminal
+    status changes, and ``discard`` drops a pending write for a deleted job.
+
+    Dirty sources registered with ``add_dirty_source`` are polled every
+    ``dirty_interval`` seconds for rows that changed without an explicit
+    ``schedule_upsert`` (such as new log lines).
+
+    Every snapshot carries the job's ``state_version``. A snapshot older than
+    the one already pending or written for that job is dropped, so a slow
+    producer can never put a stale state back over a newer one.
+    """
+
+    def __init__(self, store: JobStore, interval: float = 0.1, dirty_interval: float = 1.0) -> None:
+        self.store = store
+        self.interval = interval
+        self.dirty_interval = dirty_interval
+        self._dirty_sources: List[Callable[[], Iterable[_JobRow]]] = []
+        self._pending: Dict[int, _PendingJob] = {}
+        # Highest state_version written per job.
+        self._written: Dict[int, int] = {}
+        self._lock = threading.Lock()
+        # Held across take+write so an older snapshot can never land after a newer one.
+        self._flush_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def schedule_upsert(
+        self, job_id: int, anime_url: str, config: Dict[str, Any], state: Dict[str, Any], version: int = 0
+    ) -> None:
+        with self._lock:
+            self._offer(job_id, (anime_url, config, state, version))
+            self._ensure_thread()
+        self._wakeup.set()
+
+    def add_dirty_source(self, source: Callable[[], Iterable[_JobRow]]) -> None:
+        """Register a callable yielding ``(job_id, anime_url, config, state, version)`` rows to persist."""
+        with self._lock:
+            self._dirty_sources.append(source)
+            self._ensure_thread()
+
+    def _offer(self, job_id: int, item: _PendingJob) -> None:
+        # Caller holds self._lock.
+        version = item[3]
+        pending = self._pending.get(job_id)
+        if pending is not None and version < pending[3]:
+            return
+        if version < self._written.get(job_id, version):
+            return
+        self._pending[job_id] = item
+
+    def _ensure_thread(self) -> None:
+        # Caller holds self._lock.
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="job-store-writer", daemon=True)
+            self._thread.start()
+
+    def flush_now(self, job_id: Optional[int] = None) -> None:
+        """Write pending state synchronously: one job, or everything (dirty rows included) when ``job_id`` is None."""
+        with self._flush_lock:
+            # Collected under the flush lock: a snapshot taken here cannot be
+            # written after a newer state that another thread flushes meanwhile.
+            if job_id is None:
+                self._collect_dirty()
+            with self._lock:
+                if job_id is None:
+                    batch, self._pending = self._pending, {}
+                else:
+                    item = self._pending.pop(job_id, None)
+                    batch = {job_id: item} if item is not None else {}
+            self._write(batch)
+
+    def discard(self, job_id: int) -> None:
+        with self._lock:
+            self._pending.pop(job_id, None)
+            self._written.pop(job_id, None)
+
+    def _run(self) -> None:
+        while True:
+            self._wakeup.wait(self.dirty_interval if self._dirty_sources else None)
+            self._wakeup.clear()
+            # Let further updates for the same jobs coalesce before writing.
+            threading.Event().wait(self.interval)
+            self.flush_now()
+
+    def _collect_dirty(self) -> None:
+        for source in list(self._dirty_sources):
+            try:
+                rows = list(source())
+            except Exception as e:
+                logger.warning("Dirty job source failed: %s", e)
+                continue
+            with self._lock:
+                for job_id, anime_url, config, state, version in rows:
+                    self._offer(job_id, (anime_url, config, state, version))
+
+    def _write(self, batch: Dict[int, _PendingJob]) -> None:
+        if not batch:
+            return
+        try:
+            self.store.upsert_jobs(
+                (job_id, anime_url, config, state) for job_id, (anime_url, config, state, _) in batch.items()
+            )
+        except Exception as e:
+            logger.warning("Failed to persist %d job(s): %s", len(batch), e)
+            return
+        with self._lock:
+            for job_id, item in batch.items():
+                if item[3] > self._written.get(job_id, -1):
+                    self._written[job_id] = item[3]
@@ -1,11 +1,38 @@
 """
 Data Models
 """
+from collections import deque
 from datetime import datetime
+from itertools import islice
+
+MAX_LOGS = 100
+
+# Fields that change while a job runs; sent as a delta between full updates.
+DELTA_FIELDS = (
+    "status",
+    "progress",
+    "current_episode",
+    "total_episodes",
+    "completed_episodes",
+    "current_file",
+    "downloaded_bytes",
+    "speed_bps",
+    "speed_formatted",
+    "eta_seconds",
+    "eta_formatted",
+)
+
 
 class DownloadJob:
     """Represents a download job with progress tracking"""
     def __init__(self, job_id, anime_url, config):
+        # Bumped by add_log() and touch(); memoized to_dict()/failure blobs and
+        # persisted snapshots are compared against it.
+        self.state_version = 0
+        self._dict_cache = None
+        self._failure_blob_cache = None
+        # True when logs changed since the job was last persisted.
+        self._dirty = False
         self.job_id = job_id
         self.anime_url = anime_url
         self.config = config
@@ -14,7 +41,7 @@ class DownloadJob:
         self.current_episode = None
         self.total_episodes = 0
         self.completed_episodes = 0
-        self.logs = []
+        self.logs = deque(maxlen=MAX_LOGS)
         self.error = None
         self.downloaded_files = []
         self.merged_file = None
@@ -37,6 +64,19 @@ class DownloadJob:
         self.failure_reason = None
         self.failure_category = None
 
+        # Installed by the job's emitter; signal_progress() calls it to wake the emitter.
+        self.progress_listener = None
+
+    def signal_progress(self):
+        """Tell the job's emitter, if one is running, that progress changed."""
+        listener = self.progress_listener
+        if listener is not None:
+            listener()
+
+    def touch(self):
+        """Mark the job's state as changed, invalidating memoized views of it."""
+        self.state_version += 1
+
     def add_log(self, level, message):
         """Add a log entry"""
         timestamp = datetime.now().strftime("%H:%M:%S")
@@ -45,9 +85,29 @@ class DownloadJob:
             "level": level,
             "message": message
         })
-        # Keep only last 100 logs
-        if len(self.logs) > 100:
-            self.logs = self.logs[-100:]
+        self.state_version += 1
+        self._dirty = True
+
+    def recent_logs(self, count=20):
+        """Last ``count`` log entries, oldest first, without copying the whole buffer."""
+        tail = list(islice(reversed(self.logs), count))
+        tail.reverse()
+        return tail
+
+    def to_dict_cached(self):
+        """to_dict(), reused for finished jobs until one of their attributes changes.
+
+        Active jobs are always rebuilt: their lists are mutated in place and
+        elapsed time keeps moving.
+        """
+        if self.status not in ("completed", "failed") or self.end_time is None:
+            return self.to_dict()
+        cached = self._dict_cache
+        if cached is not None and cached[0] == self.state_version:
+            return cached[1]
+        data = self.to_dict()
+        self._dict_cache = (self.state_version, data)
+        return data
 
     def to_dict(self):
         """Convert job to dictionary for JSON serialization"""
@@ -67,7 +127,7 @@ class DownloadJob:
             "current_episode": self.current_episode,
             "total_episodes": self.total_episodes,
             "completed_episodes": self.completed_episodes,
-            "logs": self.logs[-20:],  # Return last 20 logs
+            "logs": self.recent_logs(20),
             "error": self.error,
             "downloaded_files": self.downloaded_files,
             "merged_file": self.merged_file,
@@ -86,3 +146,26 @@ class DownloadJob:
             "start_time": self.start_time.isoformat(),
             "end_time": self.end_time.isoformat() if self.end_time else None
         }
+
+    def to_delta_dict(self, shadow):
+        """Return the DELTA_FIELDS that differ from ``shadow`` and record them there.
+
+        ``shadow`` is a dict owned by the caller (one per listener stream). The
+        recent logs are included only when a new entry has been added. An empty
+        dict means nothing changed since the last call.
+        """
+        delta = {}
+        for name in DELTA_FIELDS:
+            value = getattr(self, name)
+            if name not in shadow or shadow[name] != value:
+                shadow[name] = value
+                delta[name] = value
+
+        last_log = self.logs[-1] if self.logs else None
+        if shadow.get("_last_log") is not last_log:
+            shadow["_last_log"] = last_log
+            delta["logs"] = self.recent_logs(20)
+
+        if delta:
+            delta["job_id"] = self.job_id
+        return delta
@@ -5,66 +5,132 @@ Handles URL parsing and delegates tasks to the appropriate site plugin.
 
 from __future__ import annotations
 
+import functools
 import importlib
 import inspect
 import logging
 import pkgutil
-from typing import Any, Dict, List, Type
+from typing import Any, Dict, List, Optional, Tuple, Type
+from urllib.parse import urlsplit
 
 import app.plugins as plugins_pkg
+from app.plugins import info_cache
 from app.plugins.base_plugin import BasePlugin
 from app.plugins.generic_plugin import GenericPlugin
 
 
+__all__ = ["PLUGIN_MANAGER", "PluginManager"]
+
 logger = logging.getLogger(__name__)
 
+# Plugin classes discovered in app.plugins, shared by every PluginManager in the process.
+_PLUGIN_CLASSES: Optional[List[Type[BasePlugin]]] = None
+_DISCOVERY_ERRORS: List[str] = []
+
+DISPATCH_CACHE_SIZE = 256
+
+
+def _discover_plugin_classes() -> Tuple[List[Type[BasePlugin]], List[str]]:
+    global _PLUGIN_CLASSES
+    if _PLUGIN_CLASSES is not None:
+        return _PLUGIN_CLASSES, _DISCOVERY_ERRORS
+
+    classes: List[Type[BasePlugin]] = []
+    errors: List[str] = []
+    for m in pkgutil.iter_modules(plugins_pkg.__path__):
+        module_name = m.name
+        if module_name in {"base_plugin", "generic_plugin", "__init__"}:
+            continue
+        if not module_name.endswith("_plugin"):
+            continue
+
+        try:
+            module = importlib.import_module(f"app.plugins.{module_name}")
+        except Exception as e:
+            err = f"Failed to import plugin module {module_name}: {e}"
+            logger.error(err)
+            errors.append(err)
+            continue
+
+        for _, obj in inspect.getmembers(module, inspect.isclass):
+            if not issubclass(obj, BasePlugin) or obj is BasePlugin:
+                continue
+            # Skip plugin classes a module merely imports (e.g. GenericPlugin).
+            if obj.__module__ != module.__name__:
+                continue
+            classes.append(obj)
+
+    _DISCOVERY_ERRORS[:] = errors
+    _PLUGIN_CLASSES = classes
+    return _PLUGIN_CLASSES, _DISCOVERY_ERRORS
+
 
 class PluginManager:
     def __init__(self) -> None:
         self.plugins: List[BasePlugin] = []
         self.fallback_plugin: BasePlugin = GenericPlugin()
         self.load_errors: List[str] = []
+        self._host_index: Dict[str, BasePlugin] = {}
+        # Dispatch is a pure function of the URL and the loaded plugins, so repeat
+        # lookups (job start, retries, extract_info) are served from this cache.
+        self._dispatch = functools.lru_cache(maxsize=DISPATCH_CACHE_SIZE)(self._scan_for_url)
         self._load_plugins()
 
     def _load_plugins(self) -> None:
         self.plugins = []
-        self.load_errors = []
-
-        for m in pkgutil.iter_modules(plugins_pkg.__path__):
-            module_name = m.name
-            if module_name in {"base_plugin", "generic_plugin", "__init__"}:
-                continue
-            if not module_name.endswith("_plugin"):
-                continue
+        plugin_classes, discovery_errors = _discover_plugin_classes()
+        self.load_errors = list(discovery_errors)
 
+        for plugin_cls in plugin_classes:
             try:
-                module = importlib.import_module(f"app.plugins.{module_name}")
+                plugin_instance = plugin_cls()
             except Exception as e:
-                err = f"Failed to import plugin module {module_name}: {e}"
+                err = f"Failed to instantiate plugin {plugin_cls.__name__}: {e}"
                 logger.error(err)
                 self.load_errors.append(err)
                 continue
 
-            for _, obj in inspect.getmembers(module, inspect.isclass):
-                if not issubclass(obj, BasePlugin) or obj is BasePlugin:
-                    continue
-                plugin_cls: Type[BasePlugin] = obj
-                try:
-                    plugin_instance = plugin_cls()
-                except Exception as e:
-                    err = f"Failed to instantiate plugin {plugin_cls.__name__}: {e}"
-                    logger.error(err)
-                    self.load_errors.append(err)
-                    continue
-
-                if getattr(plugin_instance, "IS_FALLBACK", False):
-                    self.fallback_plugin = plugin_instance
-                else:
-                    self.plugins.append(plugin_instance)
+            if getattr(plugin_instance, "IS_FALLBACK", False):
+                self.fallback_plugin = plugin_instance
+            else:
+                self.plugins.append(plugin_instance)
 
         self.plugins.sort(key=lambda p: p.get_priority(), reverse=True)
+        self._build_host_index()
+        self.clear_dispatch_cache()
+
+    def clear_dispatch_cache(self) -> None:
+        """Forget cached URL-to-plugin decisions; call after changing ``plugins``."""
+        self._dispatch.cache_clear()
+
+    def _build_host_index(self) -> None:
+        """Map exact hosts to the plugin a linear scan would pick for them.
+
+        A host is only indexed when every higher-priority plugin is known to
+        match a fixed set of hosts that excludes it.
+        """
+        index: Dict[str, BasePlugin] = {}
+        for pos, plugin in enumerate(self.plugins):
+            for host in getattr(plugin, "url_hosts", ()):
+                if host in index:
+                    continue
+                ahead = self.plugins[:pos]
+                if all(getattr(p, "url_hosts", None) and host not in p.url_hosts for p in ahead):
+                    index[host] = plugin
+        self._host_index = index
 
     def get_plugin_for_url(self, url: str) -> BasePlugin:
+        return self._dispatch(url)
+
+    def _scan_for_url(self, url: str) -> BasePlugin:
+        if self._host_index:
+            try:
+                plugin = self._host_index.get(urlsplit(url).netloc.lower())
+                if plugin is not None and plugin.can_handle(url):
+                    return plugin
+            except Exception:
+                pass
+
         for plugin in self.plugins:
             try:
                 if plugin.can_handle(url):
@@ -74,10 +140,21 @@ class PluginManager:
         return self.fallback_plugin
 
     def download(self, url: str, output_path: str, **kwargs: Any) -> Dict[str, Any]:
-        plugin = self.get_plugin_for_url(url)
+        return self.download_with_plugin(self.get_plugin_for_url(url), url, output_path, **kwargs)
+
+    def download_with_plugin(self, plugin: BasePlugin, url: str, output_path: str, **kwargs: Any) -> Dict[str, Any]:
+        """Like ``download`` but with the plugin already chosen, skipping dispatch."""
+        return self._run_download(plugin, "download", url, output_path, **kwargs)
+
+    def extract_and_download(self, url: str, output_path: str, **kwargs: Any) -> Dict[str, Any]:
+        """Like ``download`` but ``metadata`` also carries the plugin's extract_info fields."""
+        return self._run_download(self.get_plugin_for_url(url), "extract_and_download", url, output_path, **kwargs)
 
+    def _run_download(
+        self, plugin: BasePlugin, method: str, url: str, output_path: str, **kwargs: Any
+    ) -> Dict[str, Any]:
         try:
-            result = plugin.download(url, output_path, **kwargs)
+            result = getattr(plugin, method)(url, output_path, **kwargs)
             result.setdefault("metadata", {})
             result["metadata"].setdefault("plugin", getattr(plugin, "SITE_NAME", plugin.__class__.__name__))
             return result
@@ -88,7 +165,7 @@ class PluginManager:
                 return {"success": False, "files": [], "error": str(e), "metadata": {"plugin": "fallback"}}
 
             try:
-                result = self.fallback_plugin.download(url, output_path, **kwargs)
+                result = getattr(self.fallback_plugin, method)(url, output_path, **kwargs)
                 result.setdefault("metadata", {})
                 result["metadata"].setdefault("plugin", getattr(self.fallback_plugin, "SITE_NAME", "fallback"))
                 result["metadata"]["fallback_used"] = True
@@ -96,19 +173,63 @@ class PluginManager:
             except Exception as fallback_error:
                 return {"success": False, "files": [], "error": str(fallback_error), "metadata": {"plugin": "fallback"}}
 
-    def extract_info(self, url: str) -> Dict[str, Any]:
+    def download_many(
+        self, urls: List[str], output_path: str, *, plugin: Optional[BasePlugin] = None, **kwargs: Any
+    ) -> List[Dict[str, Any]]:
+        """Download several URLs, batching those handled by the same plugin.
+
+        Each plugin gets one ``download_many`` call for its URLs so it can reuse a
+        session; results come back in the order of ``urls``. If a plugin's batch
+        call raises, its URLs are retried one by one (with the usual fallback).
+        Pass ``plugin`` when every URL is known to belong to it, e.g. episodes
+        listed by that plugin, to skip per-URL dispatch.
+        """
+        groups: Dict[int, List[int]] = {}
+        plugins: Dict[int, BasePlugin] = {}
+        if plugin is not None:
+            groups[id(plugin)] = list(range(len(urls)))
+            plugins[id(plugin)] = plugin
+        else:
+            for i, url in enumerate(urls):
+                chosen = self.get_plugin_for_url(url)
+                groups.setdefault(id(chosen), []).append(i)
+                plugins[id(chosen)] = chosen
+
+        results: List[Dict[str, Any]] = [{} for _ in urls]
+        for key, indexes in groups.items():
+            handler = plugins[key]
+            name = getattr(handler, "SITE_NAME", handler.__class__.__name__)
+            try:
+                batch = handler.download_many([urls[i] for i in indexes], output_path, **kwargs)
+            except Exception as e:
+                logger.error("Plugin %s batch download failed: %s", name, e)
+                for i in indexes:
+                    results[i] = self.download_with_plugin(handler, urls[i], output_path, **kwargs)
+                continue
+
+            for i, result in zip(indexes, batch):
+                result.setdefault("metadata", {})
+                result["metadata"].setdefault("plugin", name)
+                results[i] = result
+        return results
+
+    def extract_info(self, url: str, refresh: bool = False) -> Dict[str, Any]:
+        if refresh:
+            info_cache.invalidate(url)
         plugin = self.get_plugin_for_url(url)
         try:
             info = plugin.extract_info(url)
             info.setdefault("site", getattr(plugin, "SITE_NAME", plugin.__class__.__name__))
             return info
-        except Exception:
+        except Exception as e:
+            logger.error("Plugin %s extract_info failed: %s", getattr(plugin, "SITE_NAME", plugin.__class__.__name__), e)
             try:
                 info = self.fallback_plugin.extract_info(url)
                 info.setdefault("site", getattr(self.fallback_plugin, "SITE_NAME", "Fallback"))
                 info["fallback_used"] = True
                 return info
-            except Exception:
+            except Exception as fallback_error:
+                logger.error("Fallback extract_info failed: %s", fallback_error)
                 return {"error": "Failed to extract info"}
 
     def list_plugins(self) -> List[Dict[str, Any]]:
@@ -134,3 +255,7 @@ class PluginManager:
         if self.load_errors:
             result.append({"name": "_load_errors", "errors": self.load_errors})
         return result
+
+
+# Process-wide instance; import this instead of constructing another manager.
+PLUGIN_MANAGER = PluginManager()
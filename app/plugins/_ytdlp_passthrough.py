@@ -0,0 +1,26 @@
+from __future__ import annotations
+
+from typing import Any, Dict, List
+
+from app.plugins.generic_plugin import GENERIC_SINGLETON
+
+
+class YtDlpPassthroughMixin:
+    """Downloads for sites that yt-dlp handles directly, via the shared GenericPlugin.
+
+    List it before BasePlugin in the bases so these methods take precedence.
+    """
+
+    def download(self, url: str, output_path: str, **kwargs: Any) -> Dict[str, Any]:
+        return GENERIC_SINGLETON.download(url, output_path, **kwargs)
+
+    def download_many(self, urls: List[str], output_path: str, **kwargs: Any) -> List[Dict[str, Any]]:
+        return GENERIC_SINGLETON.download_many(urls, output_path, **kwargs)
+
+    def extract_and_download(self, url: str, output_path: str, **kwargs: Any) -> Dict[str, Any]:
+        result = GENERIC_SINGLETON.extract_and_download(url, output_path, **kwargs)
+        if result.get("success"):
+            # The site plugin's own fields win; yt-dlp's metadata fills in what it leaves empty.
+            site = {k: v for k, v in self.extract_info(url).items() if v is not None}
+            result["metadata"] = {**(result.get("metadata") or {}), **site}
+        return result
@@ -1,15 +1,49 @@
 from __future__ import annotations
 
-from typing import Any, Dict, List, Optional
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 import os
 import re
+import threading
 from urllib.parse import urlparse
 
+import soupsieve
 from bs4 import BeautifulSoup
 
 from app.downloader import AnimeDownloader
 from app.plugins.base_plugin import BasePlugin
-from app.plugins.generic_plugin import GenericPlugin
+from app.plugins.generic_plugin import GENERIC_SINGLETON
+
+try:
+    import lxml  # noqa: F401
+
+    _HTML_PARSER = "lxml"
+except ImportError:
+    _HTML_PARSER = "html.parser"
+
+_SEASON_CONTAINER_SEL = soupsieve.compile(
+    ".seasons, .season, .season-list, .related, .related-anime, .anisc-related, .more-seasons"
+)
+_LINK_SEL = soupsieve.compile("a[href]")
+
+# Season discovery caps out at a handful of links, one worker each.
+_SEASON_FETCH_WORKERS = 6
+
+_EP_RE = re.compile(r"[?#&]ep=(\d+(?:\.\d+)?)")
+_SEASON_KW_RE = re.compile(r"\b(season|part|cour|s\d+)\b", re.IGNORECASE)
+
+# Tried in priority order: the first pattern with any match in the page wins,
+# wherever its match sits relative to the others.
+_EP_TOTAL_RES = tuple(
+    re.compile(p, re.IGNORECASE)
+    for p in (
+        r"\bEpisodes\b\s*[:\-]?\s*(\d{1,4})",
+        r"\bTotal\s+Episodes\b\s*[:\-]?\s*(\d{1,4})",
+        r"\bep_end\b\s*[:=]\s*(\d{1,4})",
+        r"\btotalEpisodes\b\s*[:=]\s*(\d{1,4})",
+    )
+)
 
 
 class AnimeKaiPlugin(BasePlugin):
@@ -21,74 +55,111 @@ class AnimeKaiPlugin(BasePlugin):
     def __init__(self) -> None:
         super().__init__()
         self._downloader = AnimeDownloader()
-        self._generic = GenericPlugin()
+        self._generic = GENERIC_SINGLETON
+        # Idle downloaders for season-fetch workers: a cloudscraper session is not
+        # safe to share between threads, so each worker borrows one of its own.
+        self._spare_downloaders: List[AnimeDownloader] = []
+        self._spare_lock = threading.Lock()
 
     def get_priority(self) -> int:
         return 100
 
     def _parse_episode_from_url(self, url: str) -> Optional[str]:
-        m = re.search(r"[?#&]ep=(\d+(?:\.\d+)?)", url)
-        if m:
-            return m.group(1)
-        return None
+        m = _EP_RE.search(url)
+        return m.group(1) if m else None
 
     def _normalize_watch_url(self, url: str) -> str:
         parts = urlparse(url)
         return f"{parts.scheme}://{parts.netloc}{parts.path}"
 
-    def _extract_expected_total_episodes_from_html(self, html: str) -> Optional[int]:
-        patterns = [
-            r"\bEpisodes\b\s*[:\-]?\s*(\d{1,4})",
-            r"\bTotal\s+Episodes\b\s*[:\-]?\s*(\d{1,4})",
-            r"\bep_end\b\s*[:=]\s*(\d{1,4})",
-            r"\btotalEpisodes\b\s*[:=]\s*(\d{1,4})",
-        ]
-        for pat in patterns:
-            m = re.search(pat, html, re.IGNORECASE)
-            if not m:
-                continue
+    @contextmanager
+    def _worker_downloader(self) -> Iterator[AnimeDownloader]:
+        with self._spare_lock:
+            downloader = self._spare_downloaders.pop() if self._spare_downloaders else None
+        if downloader is None:
+            downloader = AnimeDownloader()
+        try:
+            yield downloader
+        finally:
+            with self._spare_lock:
+                self._spare_downloaders.append(downloader)
+
+    def _fetch_html(
+        self, url: str, cache: Dict[str, Optional[str]], downloader: Optional[AnimeDownloader] = None
+    ) -> Optional[str]:
+        """Fetch a page at most once per cache; failed fetches are remembered as None."""
+        downloader = downloader or self._downloader
+        key = self._normalize_watch_url(url)
+        if key not in cache:
             try:
+                r = downloader.scraper.get(url, headers=downloader.HEADERS, timeout=30)
+                r.raise_for_status()
+                cache[key] = r.text
+            except Exception as e:
+                downloader.log("ERROR", f"Error fetching {url}: {e}")
+                cache[key] = None
+        return cache[key]
+
+    def _get_anime_details_from_html(self, html: Optional[str]) -> Tuple[Optional[str], str]:
+        if not html:
+            return None, "Unknown"
+        try:
+            return self._downloader.parse_anime_details(html)
+        except Exception:
+            return None, "Unknown"
+
+    def _fetch_season(
+        self, s_url: str, html_cache: Dict[str, Optional[str]]
+    ) -> Tuple[Optional[str], str, List[Dict[str, Any]], Optional[int]]:
+        """Fetch one season's details, episode list and expected total on a borrowed session."""
+        with self._worker_downloader() as downloader:
+            s_html = self._fetch_html(s_url, html_cache, downloader)
+            s_anime_id, s_title = self._get_anime_details_from_html(s_html)
+            eps = downloader.get_episode_list(s_anime_id) if s_anime_id else []
+        expected = self._extract_expected_total_episodes_from_html(s_html) if s_html else None
+        return s_anime_id, s_title, eps or [], expected
+
+    def _extract_expected_total_episodes_from_html(self, html: str) -> Optional[int]:
+        for pattern in _EP_TOTAL_RES:
+            m = pattern.search(html)
+            if m:
                 return int(m.group(1))
-            except Exception:
-                continue
         return None
 
-    def _discover_season_links(self, watch_url: str) -> List[Dict[str, str]]:
+    def _discover_season_links(
+        self, watch_url: str, html_cache: Optional[Dict[str, Optional[str]]] = None
+    ) -> List[Dict[str, str]]:
         """Best-effort season discovery.
 
         AniKai doesn't have a stable public "seasons" API in our core downloader,
         so we scrape the watch page and look for additional /watch/... links.
         """
 
-        try:
-            r = self._downloader.scraper.get(watch_url, headers=self._downloader.HEADERS, timeout=30)
-            r.raise_for_status()
-            html = r.text
-        except Exception:
+        html = self._fetch_html(watch_url, {} if html_cache is None else html_cache)
+        if not html:
             return [{"url": watch_url, "name": "Season 1"}]
 
-        soup = BeautifulSoup(html, "html.parser")
+        soup = BeautifulSoup(html, _HTML_PARSER)
 
         # Try to prioritize links coming from season/related areas (class names are best-effort)
-        candidate_containers = soup.select(
-            ".seasons, .season, .season-list, .related, .related-anime, .anisc-related, .more-seasons"
-        )
+        candidate_containers = _SEASON_CONTAINER_SEL.select(soup)
         if not candidate_containers:
             return [{"url": watch_url, "name": "Season 1"}]
 
-        season_keywords = re.compile(r"\b(season|part|cour|s\d+)\b", re.IGNORECASE)
+        watch_parts = urlparse(watch_url)
+        origin = f"{watch_parts.scheme}://{watch_parts.netloc}"
 
         seen: set[str] = set()
         seasons: List[Dict[str, str]] = []
         for container in candidate_containers:
-            for a in container.select("a[href]"):
+            for a in _LINK_SEL.select(container):
                 href = a.get("href") or ""
                 if "/watch/" not in href:
                     continue
                 if href.startswith("//"):
                     href = "https:" + href
                 if href.startswith("/"):
-                    href = f"{urlparse(watch_url).scheme}://{urlparse(watch_url).netloc}{href}"
+                    href = f"{origin}{href}"
                 if not href.startswith("http"):
                     continue
 
@@ -102,7 +173,7 @@ class AnimeKaiPlugin(BasePlugin):
                     name = a.get("title") or ""
 
                 # Avoid pulling unrelated shows: only accept links that look like seasons/parts.
-                if name and not season_keywords.search(name):
+                if name and not _SEASON_KW_RE.search(name):
                     continue
 
                 seasons.append({"url": normalized, "name": name})
@@ -125,7 +196,9 @@ class AnimeKaiPlugin(BasePlugin):
 
     def extract_info(self, url: str) -> Dict[str, Any]:
         watch_url = self._normalize_watch_url(url)
-        anime_id, title = self._downloader.get_anime_details(watch_url)
+        # Every page is fetched once and reused for details, season links and episode totals.
+        html_cache: Dict[str, Optional[str]] = {}
+        anime_id, title = self._get_anime_details_from_html(self._fetch_html(watch_url, html_cache))
 
         episode = self._parse_episode_from_url(url)
 
@@ -134,48 +207,45 @@ class AnimeKaiPlugin(BasePlugin):
         seasons: List[Dict[str, Any]] = []
 
         # Discover seasons (best-effort) and build full series structure.
-        season_links = self._discover_season_links(watch_url)
-        all_episode_urls_seen: set[str] = set()
-
-        for idx, season in enumerate(season_links, 1):
-            s_url = season.get("url") or watch_url
+        season_links = self._discover_season_links(watch_url, html_cache)
+        # Keyed on episode URL: dedups across seasons and keeps first-seen order.
+        all_episodes: Dict[str, Dict[str, Any]] = {}
+
+        # Season fetches are independent and I/O-bound; results are merged in discovery order.
+        season_urls = [season.get("url") or watch_url for season in season_links]
+        with ThreadPoolExecutor(max_workers=_SEASON_FETCH_WORKERS) as pool:
+            fetched = list(pool.map(lambda s_url: self._fetch_season(s_url, html_cache), season_urls))
+
+        for idx, (season, s_url, (s_anime_id, s_title, eps, expected)) in enumerate(
+            zip(season_links, season_urls, fetched), 1
+        ):
             s_name = season.get("name") or f"Season {idx}"
 
-            s_anime_id, s_title = self._downloader.get_anime_details(s_url)
             if idx == 1 and (not title or title == "Unknown"):
                 title = s_title
             if idx == 1 and (not anime_id):
                 anime_id = s_anime_id
 
             episodes_payload: List[Dict[str, Any]] = []
-            if s_anime_id:
-                eps = self._downloader.get_episode_list(s_anime_id)
-                for ep in eps:
-                    ep_id = str(ep.get("id") or "").strip()
-                    if not ep_id:
-                        continue
-                    ep_url = f"{s_url}#ep={ep_id}"
-                    if ep_url in all_episode_urls_seen:
-                        continue
-                    all_episode_urls_seen.add(ep_url)
-                    episodes_payload.append(
-                        {
-                            "episode": ep_id,
-                            "title": ep.get("title") or f"Episode {ep_id}",
-                            "subdub": ep.get("subdub") or "",
-                            "url": ep_url,
-                        }
-                    )
+            for ep in eps:
+                ep_id = str(ep.get("id") or "").strip()
+                if not ep_id:
+                    continue
+                ep_url = f"{s_url}#ep={ep_id}"
+                if ep_url in all_episodes:
+                    continue
+                payload = {
+                    "episode": ep_id,
+                    "title": ep.get("title") or f"Episode {ep_id}",
+                    "subdub": ep.get("subdub") or "",
+                    "url": ep_url,
+                }
+                all_episodes[ep_url] = payload
+                episodes_payload.append(payload)
 
             # best-effort expected total episodes from season page
-            try:
-                r = self._downloader.scraper.get(s_url, headers=self._downloader.HEADERS, timeout=30)
-                if r.ok:
-                    expected = self._extract_expected_total_episodes_from_html(r.text)
-                    if expected is not None:
-                        expected_total_episodes = max(expected_total_episodes or 0, expected)
-            except Exception:
-                pass
+            if expected is not None:
+                expected_total_episodes = max(expected_total_episodes or 0, expected)
 
             seasons.append(
                 {
@@ -187,14 +257,14 @@ class AnimeKaiPlugin(BasePlugin):
             )
 
         # total episodes is what we can actually enumerate
-        total_episodes = sum(len(s.get("episodes") or []) for s in seasons)
+        total_episodes = len(all_episodes)
 
         return {
             "title": title if title != "Unknown" else None,
             "episode": episode,
             "total_episodes": total_episodes,
             "expected_total_episodes": expected_total_episodes,
-            "episodes": all_episode_urls_seen and [ep for s in seasons for ep in (s.get("episodes") or [])] or [],
+            "episodes": list(all_episodes.values()),
             "seasons": seasons,
             "webpage_url": watch_url,
             "site": self.SITE_NAME,
@@ -1,19 +1,123 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List, Optional
+from functools import lru_cache
+from typing import Any, Dict, FrozenSet, List, Optional, Pattern, Tuple
 import re
 
 
+_SCHEME_HEAD_RE = re.compile(r"\^?https\?://(\(\?:www\\\.\)\?)?")
+_REGEX_META = frozenset("()[]{}?*+|^$.\\")
+
+
+def _literal_host(pattern: str) -> Tuple[str, bool]:
+    """Return the literal host text a URL pattern starts with.
+
+    The second item is True when the whole host is literal (the pattern continues
+    with "/"), meaning the pattern can only ever match that exact host.
+    """
+    m = _SCHEME_HEAD_RE.match(pattern)
+    if not m or _has_top_level_alternation(pattern):
+        return "", False
+
+    out: List[str] = []
+    i = m.end()
+    while i < len(pattern):
+        ch = pattern[i]
+        if ch == "\\" and i + 1 < len(pattern) and pattern[i + 1] in ".-":
+            out.append(pattern[i + 1])
+            i += 2
+        elif ch == "/":
+            return "".join(out), bool(out)
+        elif ch in _REGEX_META:
+            # An optional quantifier makes the preceding character optional too.
+            if ch in "?*{" and out:
+                out.pop()
+            break
+        else:
+            out.append(ch)
+            i += 1
+    return "".join(out), False
+
+
+def _has_top_level_alternation(pattern: str) -> bool:
+    depth = 0
+    escaped = False
+    in_class = False
+    for ch in pattern:
+        if escaped:
+            escaped = False
+        elif ch == "\\":
+            escaped = True
+        elif in_class:
+            in_class = ch != "]"
+        elif ch == "[":
+            in_class = True
+        elif ch == "(":
+            depth += 1
+        elif ch == ")":
+            depth -= 1
+        elif ch == "|" and depth == 0:
+            return True
+    return False
+
+
+@lru_cache(maxsize=None)
+def _compile_patterns(
+    patterns: Tuple[str, ...],
+) -> Tuple[Optional[Pattern[str]], Tuple[str, ...], FrozenSet[str]]:
+    """Compile a plugin's URL patterns once per distinct pattern set.
+
+    Returns the combined regex, the literal host prefixes used as a cheap
+    substring reject (empty unless every pattern has one), and the exact hosts
+    the patterns can match (empty when any pattern accepts other hosts).
+    """
+    combined = re.compile("|".join(f"(?:{p})" for p in patterns)) if patterns else None
+
+    prefixes: List[str] = []
+    hosts: set[str] = set()
+    hosts_complete = bool(patterns)
+    for p in patterns:
+        host, complete = _literal_host(p)
+        prefixes.append(host)
+        if complete:
+            hosts.add(host)
+            if _SCHEME_HEAD_RE.match(p).group(1):
+                hosts.add(f"www.{host}")
+        else:
+            hosts_complete = False
+
+    url_prefixes = tuple(prefixes) if prefixes and all(prefixes) else ()
+    url_hosts = frozenset(hosts) if hosts_complete else frozenset()
+    return combined, url_prefixes, url_hosts
+
+
 class BasePlugin(ABC):
+    # Matched with re.match: anchored at the start of the URL, prefix match unless the pattern ends in $.
     URL_PATTERNS: List[str] = []
     SITE_NAME: str = "Unknown"
 
+    _combined: Optional[Pattern[str]] = None
+    _url_prefixes: Tuple[str, ...] = ()
+    url_hosts: FrozenSet[str] = frozenset()
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)
+        # Patterns are compiled once when the plugin class is defined, not per instance.
+        cls._combined, cls._url_prefixes, cls.url_hosts = _compile_patterns(tuple(cls.URL_PATTERNS))
+
     def __init__(self) -> None:
-        self._compiled_patterns = [re.compile(p) for p in self.URL_PATTERNS]
+        # URL_PATTERNS assigned on the instance (before this runs) override the class ones.
+        patterns = self.__dict__.get("URL_PATTERNS")
+        if patterns is not None:
+            self._combined, self._url_prefixes, self.url_hosts = _compile_patterns(tuple(patterns))
 
     def can_handle(self, url: str) -> bool:
-        return any(p.match(url) for p in self._compiled_patterns)
+        if self._combined is None:
+            return False
+        if self._url_prefixes and not any(p in url for p in self._url_prefixes):
+            return False
+        return self._combined.match(url) is not None
 
     def get_priority(self) -> int:
         return 50
@@ -26,6 +130,24 @@ class BasePlugin(ABC):
     def download(self, url: str, output_path: str, **kwargs: Any) -> Dict[str, Any]:
         raise NotImplementedError
 
+    def download_many(self, urls: List[str], output_path: str, **kwargs: Any) -> List[Dict[str, Any]]:
+        """Download several URLs, one result per URL in input order.
+
+        Plugins that can share a session across URLs override this.
+        """
+        return [self.download(url, output_path, **kwargs) for url in urls]
+
+    def extract_and_download(self, url: str, output_path: str, **kwargs: Any) -> Dict[str, Any]:
+        """Download ``url`` and include its extract_info result as ``metadata``.
+
+        Plugins that get metadata out of the download itself override this to
+        avoid a second extraction.
+        """
+        result = self.download(url, output_path, **kwargs)
+        if result.get("success"):
+            result["metadata"] = {**self.extract_info(url), **(result.get("metadata") or {})}
+        return result
+
     def get_episode_list(self, series_url: str) -> List[Dict[str, Any]]:
         return []
 
@@ -1,14 +1,102 @@
 from __future__ import annotations
 
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
+import copy
+import json
+import logging
 import os
+import re
 import subprocess
-import glob
+import threading
 
 import yt_dlp
+from yt_dlp.utils import DownloadError, UnsupportedError, YoutubeDLError
 
+from app.plugins import info_cache
 from app.plugins.base_plugin import BasePlugin
 
+# Set YTDLP_SUBPROCESS=1 to run the yt-dlp CLI per download instead of the in-process API.
+_USE_SUBPROCESS = os.environ.get("YTDLP_SUBPROCESS", "").strip().lower() in {"1", "true", "yes"}
+_ERROR_TAIL_BYTES = 4096
+
+logger = logging.getLogger(__name__)
+
+# One metadata-only YoutubeDL per thread, kept alive so repeat extractions reuse its
+# opener, cookie jar and keep-alive connections. yt-dlp instances are not thread-safe.
+_ydl_local = threading.local()
+
+
+def _ydl() -> yt_dlp.YoutubeDL:
+    ydl = getattr(_ydl_local, "ydl", None)
+    if ydl is None:
+        ydl = _ydl_local.ydl = yt_dlp.YoutubeDL({"quiet": True, "no_warnings": True})
+    return ydl
+
+# Output directories already created by this process; skips makedirs on warm paths.
+_ENSURED_DIRS: set[str] = set()
+_ensured_dirs_lock = threading.Lock()
+
+
+def _ensure_dir(path: str) -> None:
+    if path in _ENSURED_DIRS:
+        return
+    os.makedirs(path, exist_ok=True)
+    with _ensured_dirs_lock:
+        _ENSURED_DIRS.add(path)
+
+_DIGITS_RE = re.compile(r"\d+")
+
+
+def _numeric_limit(value: Any) -> Optional[int]:
+    """Turn a quality/fps setting like 1080, "720p" or "best" into a numeric cap (None = no cap)."""
+    if not value:
+        return None
+    if isinstance(value, int) and not isinstance(value, bool):
+        return value
+    text = str(value).strip().lower()
+    if text in {"best", "auto"}:
+        return None
+    m = _DIGITS_RE.search(text)
+    return int(m.group(0)) if m else None
+
+
+def _is_unsupported(e: Exception) -> bool:
+    """True when yt-dlp has no extractor for the URL, which retrying won't change."""
+    if isinstance(e, DownloadError) and e.exc_info:
+        e = e.exc_info[1]
+    return isinstance(e, UnsupportedError)
+
+
+def _summarize(info: Dict[str, Any], url: str) -> Dict[str, Any]:
+    return {
+        "title": info.get("title"),
+        "duration": info.get("duration"),
+        "uploader": info.get("uploader"),
+        "webpage_url": info.get("webpage_url") or url,
+        "extractor": info.get("extractor"),
+    }
+
+
+def _files_from_info(ydl: yt_dlp.YoutubeDL, info: Dict[str, Any], merge_format: str) -> List[str]:
+    """Final file paths yt-dlp reported for a downloaded video or playlist."""
+    entries = info.get("entries")
+    if entries is not None:
+        files: List[str] = []
+        for entry in entries:
+            if entry:
+                files.extend(_files_from_info(ydl, entry, merge_format))
+        return files
+
+    files = [d["filepath"] for d in info.get("requested_downloads") or [] if d.get("filepath")]
+    if files:
+        return files
+
+    path = ydl.prepare_filename(info)
+    if info.get("requested_formats"):
+        # Separate video+audio streams were merged into the merge container.
+        path = f"{os.path.splitext(path)[0]}.{merge_format}"
+    return [path]
+
 
 class GenericPlugin(BasePlugin):
     SITE_NAME = "Generic (yt-dlp + AniKai fallback)"
@@ -21,22 +109,37 @@ class GenericPlugin(BasePlugin):
     def get_priority(self) -> int:
         return 0
 
-    def extract_info(self, url: str) -> Dict[str, Any]:
+    def extract_raw_info(self, url: str, refresh: bool = False) -> Dict[str, Any]:
+        """Full JSON-safe yt-dlp metadata for ``url``, served from the info cache when fresh.
+
+        Raises whatever yt-dlp raises; failures are never cached.
+        """
+        if not refresh:
+            cached = info_cache.get(url)
+            if cached is not None:
+                return cached
+
+        ydl = _ydl()
+        info = ydl.sanitize_info(ydl.extract_info(url, download=False))
+        info_cache.put(url, info)
+        return info
+
+    def extract_info(self, url: str, refresh: bool = False) -> Dict[str, Any]:
+        # Only unsupported URLs are remembered as failures; network errors and the
+        # like may clear up on the next try.
+        if not refresh and info_cache.failed_recently(url):
+            return {"title": None, "webpage_url": url}
         try:
-            with yt_dlp.YoutubeDL({"quiet": True, "no_warnings": True}) as ydl:
-                info = ydl.extract_info(url, download=False)
-            return {
-                "title": info.get("title"),
-                "duration": info.get("duration"),
-                "uploader": info.get("uploader"),
-                "webpage_url": info.get("webpage_url") or url,
-                "extractor": info.get("extractor"),
-            }
-        except Exception:
+            return _summarize(self.extract_raw_info(url, refresh=refresh), url)
+        except Exception as e:
+            if _is_unsupported(e):
+                info_cache.remember_failure(url)
+            elif not isinstance(e, YoutubeDLError):
+                logger.warning("Unexpected error extracting info for %s: %s", url, e)
             return {"title": None, "webpage_url": url}
 
-    def download(self, url: str, output_path: str, **kwargs: Any) -> Dict[str, Any]:
-        os.makedirs(output_path, exist_ok=True)
+    def _download_options(self, output_path: str, **kwargs: Any) -> Dict[str, Any]:
+        _ensure_dir(output_path)
 
         outtmpl = os.path.join(output_path, "%(title)s-%(id)s.%(ext)s")
         fmt = kwargs.get("format") or "bestvideo+bestaudio/best"
@@ -46,21 +149,109 @@ class GenericPlugin(BasePlugin):
         fps = kwargs.get("fps")
 
         constraints = []
-        if quality and str(quality).strip().lower() not in {"", "best", "auto"}:
-            quality_digits = "".join(ch for ch in str(quality) if ch.isdigit())
-            if quality_digits:
-                constraints.append(f"height<={int(quality_digits)}")
-        if fps and str(fps).strip().lower() not in {"", "best", "auto"}:
-            fps_digits = "".join(ch for ch in str(fps) if ch.isdigit())
-            if fps_digits:
-                constraints.append(f"fps<={int(fps_digits)}")
+        max_height = _numeric_limit(quality)
+        if max_height is not None:
+            constraints.append(f"height<={max_height}")
+        max_fps = _numeric_limit(fps)
+        if max_fps is not None:
+            constraints.append(f"fps<={max_fps}")
 
         if constraints:
             selector = "[" + "][".join(constraints) + "]"
             fmt = f"bestvideo{selector}+bestaudio/best{selector}/best"
 
-        before_files = set(glob.glob(os.path.join(output_path, "*")))
+        return {
+            "outtmpl": outtmpl,
+            "format": fmt,
+            "merge_output_format": str(merge_format),
+            "quiet": True,
+            "no_warnings": True,
+            "noprogress": True,
+        }
 
+    def download(self, url: str, output_path: str, **kwargs: Any) -> Dict[str, Any]:
+        return self._download_one(url, output_path, False, **kwargs)
+
+    def extract_and_download(self, url: str, output_path: str, **kwargs: Any) -> Dict[str, Any]:
+        """Download ``url`` and return its metadata from the same extractor run.
+
+        The result is the usual download dict, with ``metadata`` holding the
+        extract_info summary and ``info`` the full yt-dlp info dict. The info is
+        also stored in the info cache.
+        """
+        return self._download_one(url, output_path, True, **kwargs)
+
+    def _download_one(self, url: str, output_path: str, with_info: bool, **kwargs: Any) -> Dict[str, Any]:
+        ydl_opts = self._download_options(output_path, **kwargs)
+        if _USE_SUBPROCESS:
+            return self._download_subprocess(
+                url, ydl_opts["outtmpl"], ydl_opts["format"], ydl_opts["merge_output_format"], with_info
+            )
+
+        # Metadata from an earlier extract_info (e.g. a UI preview) saves a second extraction.
+        # yt-dlp mutates the dict it processes: copy the caller's, while the cache
+        # already hands out a private copy.
+        prefetched_info = kwargs.get("prefetched_info")
+        prefetched_info = copy.deepcopy(prefetched_info) if prefetched_info else info_cache.get(url)
+        try:
+            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+                return self._download_with(
+                    ydl, url, ydl_opts["merge_output_format"], prefetched_info, with_info
+                )
+        except Exception as e:
+            return {"success": False, "files": [], "error": str(e), "metadata": {}}
+
+    def download_many(self, urls: List[str], output_path: str, **kwargs: Any) -> List[Dict[str, Any]]:
+        """Download several URLs through one YoutubeDL session.
+
+        Extractor setup, player JS and HTTP connections are reused across URLs.
+        Results are returned in the same order as ``urls``.
+        """
+        if _USE_SUBPROCESS or len(urls) < 2:
+            return [self.download(url, output_path, **kwargs) for url in urls]
+
+        ydl_opts = self._download_options(output_path, **kwargs)
+        try:
+            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+                return [
+                    self._download_with(ydl, url, ydl_opts["merge_output_format"], info_cache.get(url))
+                    for url in urls
+                ]
+        except Exception as e:
+            return [{"success": False, "files": [], "error": str(e), "metadata": {}} for _ in urls]
+
+    @staticmethod
+    def _download_with(
+        ydl: yt_dlp.YoutubeDL,
+        url: str,
+        merge_format: str,
+        prefetched_info: Optional[Dict[str, Any]] = None,
+        with_info: bool = False,
+    ) -> Dict[str, Any]:
+        try:
+            if prefetched_info:
+                try:
+                    # Reuse metadata from extract_raw_info instead of extracting again.
+                    info = ydl.process_ie_result(prefetched_info, download=True)
+                except yt_dlp.utils.DownloadError:
+                    # Stream URLs in older metadata may have expired.
+                    info = ydl.extract_info(url, download=True)
+            else:
+                info = ydl.extract_info(url, download=True)
+            files = _files_from_info(ydl, info or {}, merge_format)
+            result = {"success": True, "files": files, "error": None, "metadata": {}}
+            if with_info and info:
+                info = ydl.sanitize_info(info)
+                info_cache.put(url, info)
+                result["metadata"] = _summarize(info, url)
+                result["info"] = info
+            return result
+        except Exception as e:
+            return {"success": False, "files": [], "error": str(e), "metadata": {}}
+
+    def _download_subprocess(
+        self, url: str, outtmpl: str, fmt: str, merge_format: str, with_info: bool = False
+    ) -> Dict[str, Any]:
         cmd = [
             "yt-dlp",
             "-o",
@@ -68,24 +259,54 @@ class GenericPlugin(BasePlugin):
             "-f",
             fmt,
             "--merge-output-format",
-            str(merge_format),
-            url,
+            merge_format,
+            "--no-progress",
+            # yt-dlp prints each final path after merging/moving; no directory scan needed.
+            # --print also implies --quiet, so stdout carries nothing else.
+            "--no-simulate",
+            "--print",
+            "after_move:filepath",
         ]
+        if with_info:
+            cmd.append("--write-info-json")
+        cmd.append(url)
 
         try:
-            proc = subprocess.run(cmd, capture_output=True, text=True, check=False)
+            proc = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, check=False)
             if proc.returncode != 0:
-                err = (proc.stderr or proc.stdout or "yt-dlp failed").strip()
+                # Only the tail of the output is decoded; it holds the actual error.
+                tail = (proc.stderr or proc.stdout)[-_ERROR_TAIL_BYTES:]
+                err = tail.decode("utf-8", "replace").strip() or "yt-dlp failed"
                 return {"success": False, "files": [], "error": err, "metadata": {}}
 
-            after_files = set(glob.glob(os.path.join(output_path, "*")))
-            new_files = sorted(after_files - before_files)
-            if not new_files:
-                # Heuristic: pick latest modified file
-                all_files = [p for p in after_files if os.path.isfile(p)]
-                all_files.sort(key=lambda p: os.path.getmtime(p), reverse=True)
-                new_files = all_files[:1]
-
-            return {"success": True, "files": new_files, "error": None, "metadata": {}}
+            stdout = proc.stdout.decode("utf-8", "replace")
+            new_files = [line.strip() for line in stdout.splitlines() if line.strip()]
+            result = {"success": True, "files": new_files, "error": None, "metadata": {}}
+            if with_info and new_files:
+                info = self._pop_info_json(new_files[0])
+                if info:
+                    info_cache.put(url, info)
+                    result["metadata"] = _summarize(info, url)
+                    result["info"] = info
+            return result
         except Exception as e:
             return {"success": False, "files": [], "error": str(e), "metadata": {}}
+
+    @staticmethod
+    def _pop_info_json(media_path: str) -> Optional[Dict[str, Any]]:
+        """Read and remove the .info.json yt-dlp wrote next to a downloaded file."""
+        path = f"{os.path.splitext(media_path)[0]}.info.json"
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                info = json.load(f)
+        except (OSError, ValueError):
+            return None
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+        return info
+
+
+# Shared instance for plugins that delegate downloads to yt-dlp.
+GENERIC_SINGLETON = GenericPlugin()
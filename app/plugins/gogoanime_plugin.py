@@ -3,11 +3,13 @@ from __future__ import annotations
 from typing import Any, Dict
 import re
 
+from app.plugins._ytdlp_passthrough import YtDlpPassthroughMixin
 from app.plugins.base_plugin import BasePlugin
-from app.plugins.generic_plugin import GenericPlugin
 
+_EP_RE = re.compile(r"episode-(\d+)")
 
-class GogoAnimePlugin(BasePlugin):
+
+class GogoAnimePlugin(YtDlpPassthroughMixin, BasePlugin):
     SITE_NAME = "GogoAnime"
     URL_PATTERNS = [
         r"https?://(?:www\.)?(?:gogoanime|gogoanime\d+)\.(?:io|co|org|tv)/.+",
@@ -18,7 +20,7 @@ class GogoAnimePlugin(BasePlugin):
         is_episode = "/episode-" in url or "-episode-" in url
         episode = None
         if is_episode:
-            m = re.search(r"episode-(\d+)", url)
+            m = _EP_RE.search(url)
             episode = int(m.group(1)) if m else None
         return {
             "title": None,
@@ -27,8 +29,5 @@ class GogoAnimePlugin(BasePlugin):
             "webpage_url": url,
         }
 
-    def download(self, url: str, output_path: str, **kwargs: Any) -> Dict[str, Any]:
-        return GenericPlugin().download(url, output_path, **kwargs)
-
     def get_priority(self) -> int:
         return 80
@@ -3,11 +3,13 @@ from __future__ import annotations
 from typing import Any, Dict
 import re
 
+from app.plugins._ytdlp_passthrough import YtDlpPassthroughMixin
 from app.plugins.base_plugin import BasePlugin
-from app.plugins.generic_plugin import GenericPlugin
 
+_EP_RE = re.compile(r"[?&]ep=(\d+)")
 
-class HiAnimePlugin(BasePlugin):
+
+class HiAnimePlugin(YtDlpPassthroughMixin, BasePlugin):
     SITE_NAME = "HiAnime (Aniwatch)"
     URL_PATTERNS = [
         r"https?://(?:www\.)?(?:hianime|aniwatch)\.(?:to|tv)/.+",
@@ -15,7 +17,7 @@ class HiAnimePlugin(BasePlugin):
 
     def extract_info(self, url: str) -> Dict[str, Any]:
         episode_id = None
-        m = re.search(r"[?&]ep=(\d+)", url)
+        m = _EP_RE.search(url)
         if m:
             episode_id = m.group(1)
         return {
@@ -24,8 +26,5 @@ class HiAnimePlugin(BasePlugin):
             "webpage_url": url,
         }
 
-    def download(self, url: str, output_path: str, **kwargs: Any) -> Dict[str, Any]:
-        return GenericPlugin().download(url, output_path, **kwargs)
-
     def get_priority(self) -> int:
         return 85
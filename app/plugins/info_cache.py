@@ -0,0 +1,173 @@
+"""Memory + disk cache for yt-dlp metadata, keyed by normalized URL."""
+from __future__ import annotations
+
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+import hashlib
+import json
+import os
+import threading
+import time
+
+MEMORY_ENTRIES = 256
+TTL_SECONDS = 24 * 3600
+FAILURE_TTL_SECONDS = 5 * 60
+# Expired disk entries are swept on write, at most this often.
+PRUNE_INTERVAL_SECONDS = 3600
+
+_TRACKING_PARAMS = frozenset({"fbclid", "gclid", "igshid", "si", "feature", "ref", "ref_src"})
+
+# Entries are held as their JSON text so every reader decodes its own copy and
+# can mutate it without touching the cache.
+_memory: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+_failures: Dict[str, float] = {}
+_lock = threading.Lock()
+_last_prune = 0.0
+
+
+def _cache_dir() -> str:
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "ani-downloader", "meta")
+
+
+def cache_key(url: str) -> str:
+    """Normalize a URL so tracking parameters don't split cache entries."""
+    parts = urlsplit(url.strip())
+    query = [
+        (k, v)
+        for k, v in parse_qsl(parts.query, keep_blank_values=True)
+        if k not in _TRACKING_PARAMS and not k.startswith("utm_")
+    ]
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path, urlencode(query), parts.fragment))
+
+
+def _disk_path(key: str) -> str:
+    return os.path.join(_cache_dir(), hashlib.sha1(key.encode("utf-8")).hexdigest() + ".json")
+
+
+def get(url: str) -> Optional[Dict[str, Any]]:
+    """Return a private copy of the cached info for ``url``, or None when missing or expired."""
+    key = cache_key(url)
+    now = time.time()
+    with _lock:
+        hit = _memory.get(key)
+        if hit is not None:
+            if now - hit[0] < TTL_SECONDS:
+                _memory.move_to_end(key)
+                return json.loads(hit[1])
+            del _memory[key]
+
+    path = _disk_path(key)
+    try:
+        stored_at = os.path.getmtime(path)
+        if now - stored_at >= TTL_SECONDS:
+            return None
+        with open(path, "r", encoding="utf-8") as f:
+            text = f.read()
+        info = json.loads(text)
+    except (OSError, ValueError):
+        return None
+
+    _remember(key, stored_at, text)
+    return info
+
+
+def put(url: str, info: Dict[str, Any]) -> None:
+    try:
+        text = json.dumps(info, ensure_ascii=False, separators=(",", ":"))
+    except (TypeError, ValueError):
+        return
+
+    key = cache_key(url)
+    now = time.time()
+    _remember(key, now, text)
+
+    path = _disk_path(key)
+    tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(text)
+        os.replace(tmp, path)
+    except OSError:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+    _maybe_prune(now)
+
+
+def _maybe_prune(now: float) -> None:
+    """Delete expired disk entries, at most once per PRUNE_INTERVAL_SECONDS."""
+    global _last_prune
+    with _lock:
+        if now - _last_prune < PRUNE_INTERVAL_SECONDS:
+            return
+        _last_prune = now
+    try:
+        with os.scandir(_cache_dir()) as it:
+            for entry in it:
+                if not entry.name.endswith(".json"):
+                    continue
+                try:
+                    if now - entry.stat().st_mtime >= TTL_SECONDS:
+                        os.remove(entry.path)
+                except OSError:
+                    pass
+    except OSError:
+        pass
+
+
+def remember_failure(url: str) -> None:
+    """Record that ``url`` can't be extracted so retries within FAILURE_TTL_SECONDS skip the network."""
+    now = time.time()
+    with _lock:
+        _failures[cache_key(url)] = now
+        if len(_failures) > MEMORY_ENTRIES:
+            for key in [k for k, t in _failures.items() if now - t >= FAILURE_TTL_SECONDS]:
+                del _failures[key]
+
+
+def failed_recently(url: str) -> bool:
+    key = cache_key(url)
+    with _lock:
+        failed_at = _failures.get(key)
+        if failed_at is None:
+            return False
+        if time.time() - failed_at < FAILURE_TTL_SECONDS:
+            return True
+        del _failures[key]
+        return False
+
+
+def invalidate(url: Optional[str] = None) -> None:
+    """Drop one URL's cached metadata and failure, or everything when ``url`` is None."""
+    if url is None:
+        with _lock:
+            _memory.clear()
+            _failures.clear()
+        try:
+            for name in os.listdir(_cache_dir()):
+                if name.endswith(".json"):
+                    os.remove(os.path.join(_cache_dir(), name))
+        except OSError:
+            pass
+        return
+
+    key = cache_key(url)
+    with _lock:
+        _memory.pop(key, None)
+        _failures.pop(key, None)
+    try:
+        os.remove(_disk_path(key))
+    except OSError:
+        pass
+
+
+def _remember(key: str, stored_at: float, text: str) -> None:
+    with _lock:
+        _memory[key] = (stored_at, text)
+        _memory.move_to_end(key)
+        while len(_memory) > MEMORY_ENTRIES:
+            _memory.popitem(last=False)
@@ -2,12 +2,6 @@
 AnimeKai route adapter (legacy plugin bridge).
 """
 
-import sys
-import os
-
-# Add the project directory to the Python path
-sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
-
 from app.utils import Plugin
 from app.routes.download import run_download_job
 from flask import current_app
@@ -22,4 +16,4 @@ class AnimeKaiPlugin(Plugin):
             run_download_job(job, download_folder)
         except Exception as e:
             current_app.logger.error(f"AnimeKaiPlugin download error: {e}")
-            raise
\ No newline at end of file
+            raise
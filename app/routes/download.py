@@ -3,8 +3,17 @@ Download API Routes
 Handles anime information fetching, download job management, and execution
 """
 from flask import Blueprint, jsonify, request, current_app
+import atexit
+import heapq
+import itertools
 import threading
 import os
+import re
+import stat
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Deque, Dict, List, Optional, Tuple
 from datetime import datetime
 import logging
 from app.utils import login_required
@@ -12,8 +21,9 @@ from app.downloader import AnimeDownloader
 from app.models import DownloadJob
 from app.extensions import socketio
 from app.download_eta_calculator import AdvancedETACalculator, format_speed
-from app.plugin_manager import PluginManager
+from app.plugin_manager import PLUGIN_MANAGER
 from app.job_store import JobStore
+from app.job_store_writer import BufferedJobWriter
 
 download_bp = Blueprint('download', __name__, url_prefix='/api/download')
 
@@ -21,65 +31,145 @@ logger = logging.getLogger(__name__)
 
 
 def _build_job_store() -> JobStore:
-    db_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), '..', 'downloads', 'jobs.sqlite3')
-    return JobStore(os.path.abspath(db_path))
+    # Same folder create_app() uses for DOWNLOAD_FOLDER, so the database follows it.
+    base_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), '..')
+    download_folder = os.environ.get('DOWNLOAD_FOLDER', os.path.join(base_dir, 'downloads'))
+    return JobStore(os.path.abspath(os.path.join(download_folder, 'jobs.sqlite3')))
 
 
 job_store = _build_job_store()
+job_writer = BufferedJobWriter(job_store)
+# atexit runs handlers last-in first-out: flush pending rows, then checkpoint.
+atexit.register(job_store.checkpoint)
+atexit.register(job_writer.flush_now)
 
 
-def _persist_job(job: DownloadJob) -> None:
+def _persist_job(job: DownloadJob, durable: Optional[bool] = None) -> None:
+    """Queue the job's state for writing; ``durable`` writes it before returning.
+
+    ``durable`` defaults to True for finished jobs, so final states are written
+    before anyone is told the job finished.
+    """
+    if durable is None:
+        durable = job.status in {"completed", "failed"}
     try:
-        job_store.upsert_job(job.job_id, job.anime_url, job.config, job.to_dict())
+        job._dirty = False
+        job.touch()
+        # Read before the snapshot, as in _dirty_job_rows: a version read afterwards
+        # could belong to a newer (e.g. terminal) persist and outrank it.
+        version = job.state_version
+        job_writer.schedule_upsert(job.job_id, job.anime_url, job.config, job.to_dict(), version)
+        if durable:
+            job_writer.flush_now(job.job_id)
     except Exception as e:
         logger.warning("Failed to persist job %s: %s", job.job_id, e)
 
 
+def _job_from_row(row: dict) -> DownloadJob:
+    job = DownloadJob(row["job_id"], row["anime_url"], row["config"])
+    state = row.get("state", {})
+    for key, value in state.items():
+        if key in {"start_time", "end_time"} and value:
+            try:
+                setattr(job, key, datetime.fromisoformat(value))
+            except Exception:
+                continue
+        elif key == "logs":
+            job.logs.extend(value or [])
+        elif hasattr(job, key):
+            setattr(job, key, value)
+    return job
+
+
 def _hydrate_jobs_from_store() -> None:
-    global job_counter
     try:
-        rows = job_store.load_jobs()
-        for row in rows:
-            job = DownloadJob(row["job_id"], row["anime_url"], row["config"])
-            state = row.get("state", {})
-            for key, value in state.items():
-                if key in {"start_time", "end_time"} and value:
-                    try:
-                        setattr(job, key, datetime.fromisoformat(value))
-                    except Exception:
-                        continue
-                elif hasattr(job, key):
-                    setattr(job, key, value)
-            download_jobs[job.job_id] = job
-        job_counter = max(job_counter, job_store.get_max_job_id())
+        rows = list(job_store.load_recent_jobs(MAX_RESIDENT_JOBS))
+        for row in reversed(rows):
+            download_jobs[row["job_id"]] = _job_from_row(row)
     except Exception as e:
         logger.warning("Failed loading jobs from store: %s", e)
 
 
-# Global storage for download jobs
-download_jobs = {}
-job_counter = 0
-job_lock = threading.Lock()
-
-job_emitters = {}
-job_emitters_lock = threading.Lock()
-plugin_manager = PluginManager()
+# Resident jobs, in id (= start) order: every active job plus the most recent
+# finished ones. Older finished jobs are evicted and read back from job_store
+# on demand by _lookup_job.
+MAX_RESIDENT_JOBS = max(1, int(os.getenv("MAX_RESIDENT_JOBS", "100")))
+download_jobs: Dict[int, DownloadJob] = {}
+_download_jobs_lock = threading.Lock()
+
+
+def _dirty_job_rows():
+    """Rows for resident jobs whose logs changed since they were last persisted."""
+    with _download_jobs_lock:
+        dirty = [job for job in download_jobs.values() if job._dirty]
+    for job in dirty:
+        # Cleared before the snapshot so a log added meanwhile marks it again;
+        # the version is read first so it never overstates the snapshot.
+        job._dirty = False
+        version = job.state_version
+        yield job.job_id, job.anime_url, job.config, job.to_dict(), version
+
+
+job_writer.add_dirty_source(_dirty_job_rows)
+
+# How many episodes ahead run_download_job resolves servers and video data.
+EPISODE_PREFETCH_WORKERS = 4
+
+# A few shared emitter workers service every active job. A job is pushed as soon as
+# it signals progress, and otherwise once per heartbeat. Workers wait on one shared
+# condition, never on a single job, so any job's signal wakes an idle worker.
+EMIT_HEARTBEAT_SECONDS = 1.0
+EMITTER_WORKERS = max(1, int(os.getenv("EMITTER_WORKERS", "4")))
+_emit_cond = threading.Condition()
+# Heartbeats as (due_ns, seq, state); an entry is stale unless seq == state.heartbeat_seq.
+_emit_heartbeats: List[Tuple[int, int, "_EmitterState"]] = []
+# Jobs that signalled progress, in signal order.
+_emit_ready: Deque["_EmitterState"] = deque()
+_emit_seq = itertools.count()
+_active_emitters: set = set()
+_active_emitters_lock = threading.Lock()
+_emitter_workers_started = False
+plugin_manager = PLUGIN_MANAGER
+
+
+# Categories in priority order; the first one with any keyword in the blob wins.
+_FAILURE_CATEGORIES = (
+    ("network_or_rate_limit", ["timeout", "timed out", "connection", "network", "403", "429"]),
+    ("merge_failure", ["merge", "concat", "ffmpeg"]),
+    ("source_resolution_failure", ["no servers", "could not choose server", "resolve video data", "episode token"]),
+    ("plugin_failure", ["plugin", "extractor", "unsupported", "youtube"]),
+)
+_FAILURE_PRIORITY = {category: rank for rank, (category, _) in enumerate(_FAILURE_CATEGORIES)}
+# One alternation with a named group per category, so the blob is scanned once.
+_FAILURE_RE = re.compile(
+    "|".join(
+        f"(?P<{category}>{'|'.join(re.escape(k) for k in keywords)})"
+        for category, keywords in _FAILURE_CATEGORIES
+    )
+)
 
 
-def _categorize_failure(job: DownloadJob) -> str:
+def _failure_blob(job: DownloadJob) -> str:
+    """Lowercased error plus last 20 log messages, rebuilt only when the job changed."""
+    cached = job._failure_blob_cache
+    if cached is not None and cached[0] == job.state_version:
+        return cached[1]
     err = (job.error or "").lower()
-    recent_logs = "\n".join((l.get("message") or "") for l in (job.logs or [])[-20:]).lower()
+    recent_logs = "\n".join((l.get("message") or "") for l in job.recent_logs(20)).lower()
     blob = f"{err}\n{recent_logs}"
+    job._failure_blob_cache = (job.state_version, blob)
+    return blob
+
 
-    if any(k in blob for k in ["timeout", "timed out", "connection", "network", "403", "429"]):
-        return "network_or_rate_limit"
-    if any(k in blob for k in ["merge", "concat", "ffmpeg"]):
-        return "merge_failure"
-    if any(k in blob for k in ["no servers", "could not choose server", "resolve video data", "episode token"]):
-        return "source_resolution_failure"
-    if any(k in blob for k in ["plugin", "extractor", "unsupported", "youtube"]):
-        return "plugin_failure"
-    return "unknown"
+def _categorize_failure(job: DownloadJob) -> str:
+    best = None
+    for match in _FAILURE_RE.finditer(_failure_blob(job)):
+        rank = _FAILURE_PRIORITY[match.lastgroup]
+        if best is None or rank < best:
+            best = rank
+            if rank == 0:
+                break
+    return _FAILURE_CATEGORIES[best][0] if best is not None else "unknown"
 
 
 def _build_recovery_plan(job: DownloadJob) -> list:
@@ -127,23 +217,49 @@ def _build_recovery_plan(job: DownloadJob) -> list:
 
 
 def _create_job(anime_url: str, config: dict, *, parent_job_id=None, retry_count=0, recovery_plan=None) -> DownloadJob:
-    global job_counter
-    with job_lock:
-        job_counter += 1
-        job_id = job_counter
+    job_id = next(_job_id_iter)
     job = DownloadJob(job_id, anime_url, config)
     job.parent_job_id = parent_job_id
     job.retry_count = retry_count
     job.recovery_plan = recovery_plan or []
-    download_jobs[job_id] = job
+    with _download_jobs_lock:
+        download_jobs[job_id] = job
+        _evict_finished_jobs()
     _persist_job(job)
     return job
 
 
+def _evict_finished_jobs() -> None:
+    """Drop the oldest finished jobs until at most MAX_RESIDENT_JOBS remain. Caller holds the lock."""
+    excess = len(download_jobs) - MAX_RESIDENT_JOBS
+    if excess <= 0:
+        return
+    evict = []
+    for job_id, job in download_jobs.items():
+        if job.status in {"completed", "failed"}:
+            evict.append(job_id)
+            if len(evict) == excess:
+                break
+    for job_id in evict:
+        del download_jobs[job_id]
+
+
+def _lookup_job(job_id: int) -> Optional[DownloadJob]:
+    """Resident job, or a detached copy rebuilt from job_store for evicted ones."""
+    job = download_jobs.get(job_id)
+    if job is not None:
+        return job
+    row = job_store.load_job(job_id)
+    return _job_from_row(row) if row else None
+
+
+_DIGITS_RE = re.compile(r"\d+")
+
+
 def _extract_number(value):
     try:
-        digits = "".join(c for c in str(value) if c.isdigit())
-        return int(digits) if digits else None
+        digits = _DIGITS_RE.findall(str(value))
+        return int("".join(digits)) if digits else None
     except Exception:
         return None
 
@@ -196,94 +312,223 @@ def _collect_stream_options(downloader: AnimeDownloader, episode: dict):
     return options
 
 
-def _sum_downloaded_bytes(job: DownloadJob, download_folder: str) -> int:
-    total = 0
+def _file_size(path: str) -> Optional[int]:
     try:
-        if job.anime_title:
-            job_dir = os.path.join(download_folder, job.anime_title)
-            for name in job.downloaded_files or []:
-                p = os.path.join(job_dir, name)
-                if os.path.exists(p) and os.path.isfile(p):
-                    total += os.path.getsize(p)
-    except Exception as e:
-        logger.debug("Failed summing current file size for job %s: %s", job.job_id, e)
-
-    try:
-        if job.anime_title and job.current_file:
-            p = os.path.join(download_folder, job.anime_title, job.current_file)
-            if os.path.exists(p) and os.path.isfile(p):
-                total += os.path.getsize(p)
-    except Exception as e:
-        logger.debug("Non-fatal stream option collection error: %s", e)
-    return total
-
-
-def _start_job_emitter(job: DownloadJob, download_folder: str) -> None:
-    with job_emitters_lock:
-        if job.job_id in job_emitters:
-            return
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_size if stat.S_ISREG(st.st_mode) else None
 
-    def _run() -> None:
-        calc = AdvancedETACalculator(window_size=8)
-        last_bytes = 0
-        calc_started = False
 
-        while job.status not in {"completed", "failed"}:
-            try:
-                if (not calc_started) and job.total_episodes and job.total_episodes > 0:
-                    calc.start(float(job.total_episodes))
-                    calc_started = True
+def _sum_downloaded_bytes(
+    job: DownloadJob, job_dir: Optional[str], finished_sizes: Optional[Dict[str, int]] = None
+) -> int:
+    """Bytes on disk for the job's finished files plus the file in progress.
 
-                downloaded_units = float(job.completed_episodes)
-                eta_info = calc.update(downloaded_units) if calc_started else None
+    Finished episodes don't change size, so callers polling repeatedly pass a
+    ``finished_sizes`` dict that remembers them; each poll then stats only the
+    current file and any newly finished ones.
+    """
+    if not job_dir:
+        return 0
+    if finished_sizes is None:
+        finished_sizes = {}
 
-                downloaded_bytes = _sum_downloaded_bytes(job, download_folder)
-                job.downloaded_bytes = downloaded_bytes
+    total = 0
+    for name in job.downloaded_files or []:
+        size = finished_sizes.get(name)
+        if size is None:
+            size = _file_size(os.path.join(job_dir, name))
+            if size is None:
+                continue
+            finished_sizes[name] = size
+        total += size
 
-                delta = max(0, downloaded_bytes - last_bytes)
-                last_bytes = downloaded_bytes
+    if job.current_file:
+        total += _file_size(os.path.join(job_dir, job.current_file)) or 0
+    return total
 
-                job.speed_bps = float(delta)
-                job.speed_formatted = format_speed(float(delta))
-                if eta_info:
-                    job.eta_seconds = eta_info.get("eta_seconds")
-                    job.eta_formatted = eta_info.get("eta_formatted")
-                else:
-                    job.eta_seconds = None
-                    job.eta_formatted = None
-
-                _persist_job(job)
-
-                socketio.emit("job_update", job.to_dict())
-                socketio.emit(
-                    "progress_update",
-                    {
-                        "job_id": job.job_id,
-                        "progress": job.progress,
-                        "speed": job.speed_formatted or "0 B/s",
-                        "eta": job.eta_formatted or "Calculating...",
-                    },
-                )
-            except Exception as e:
-                logger.debug("Emitter update failed for job %s: %s", job.job_id, e)
-            finally:
-                try:
-                    threading.Event().wait(1.0)
-                except Exception as e:
-                    logger.debug("Emitter sleep failed for job %s: %s", job.job_id, e)
 
+class _EmitterState:
+    """Per-job progress tracking carried between emitter ticks."""
+
+    def __init__(self, job: DownloadJob, download_folder: str) -> None:
+        self.job = job
+        self.download_folder = download_folder
+        self.calc = AdvancedETACalculator(window_size=8)
+        self.calc_started = False
+        self.last_bytes = 0
+        self.last_ns = time.monotonic_ns()
+        self.finished_sizes: Dict[str, int] = {}
+        self._job_dir_title: Optional[str] = None
+        self._job_dir: Optional[str] = None
+        # Values last sent to clients; ticks emit only what changed since then.
+        self.sent_fields: Dict[str, object] = {}
+        self.sent_status: Optional[str] = None
+        # Scheduling flags, guarded by _emit_cond.
+        self.heartbeat_seq: Optional[int] = None
+        self.ready = False
+        self.running = False
+        self.signalled = False
+
+    def job_dir(self) -> Optional[str]:
+        """The job's download directory, joined once per anime_title rather than every tick."""
+        title = self.job.anime_title
+        if not title:
+            return None
+        if title != self._job_dir_title:
+            self._job_dir_title = title
+            self._job_dir = os.path.join(self.download_folder, title)
+        return self._job_dir
+
+
+def _emit_tick(state: _EmitterState) -> bool:
+    """Refresh and push one job's progress. Returns False once the job has finished."""
+    job = state.job
+    if job.status in {"completed", "failed"}:
         try:
             socketio.emit("job_update", job.to_dict())
         except Exception as e:
             logger.debug("Final emitter push failed for job %s: %s", job.job_id, e)
+        return False
+
+    try:
+        if (not state.calc_started) and job.total_episodes and job.total_episodes > 0:
+            state.calc.start(float(job.total_episodes))
+            state.calc_started = True
+
+        downloaded_units = float(job.completed_episodes)
+        eta_info = state.calc.update(downloaded_units) if state.calc_started else None
+
+        downloaded_bytes = _sum_downloaded_bytes(job, state.job_dir(), state.finished_sizes)
+        job.downloaded_bytes = downloaded_bytes
+
+        now_ns = time.monotonic_ns()
+        delta = max(0, downloaded_bytes - state.last_bytes)
+        dt_ns = now_ns - state.last_ns
+        state.last_bytes = downloaded_bytes
+        state.last_ns = now_ns
+
+        # Wakeups are irregular now, so speed is bytes over the actual interval.
+        speed = delta * 1_000_000_000 / dt_ns if dt_ns > 0 else 0.0
+        job.speed_bps = speed
+        job.speed_formatted = format_speed(speed)
+        if eta_info:
+            job.eta_seconds = eta_info.get("eta_seconds")
+            job.eta_formatted = eta_info.get("eta_formatted")
+        else:
+            job.eta_seconds = None
+            job.eta_formatted = None
+
+        if eta_info and not eta_info.get("should_emit", True):
+            return True
+
+        _persist_job(job)
+
+        # Full dicts only on status transitions; in between, a delta of the live fields.
+        if job.status != state.sent_status:
+            state.sent_status = job.status
+            job.to_delta_dict(state.sent_fields)
+            socketio.emit("job_update", job.to_dict())
+        else:
+            delta = job.to_delta_dict(state.sent_fields)
+            if delta:
+                socketio.emit("job_delta", delta)
+        socketio.emit(
+            "progress_update",
+            {
+                "job_id": job.job_id,
+                "progress": job.progress,
+                "speed": job.speed_formatted or "0 B/s",
+                "eta": job.eta_formatted or "Calculating...",
+            },
+        )
+    except Exception as e:
+        logger.debug("Emitter update failed for job %s: %s", job.job_id, e)
+    return True
+
+
+def _signal_emit(state: _EmitterState) -> None:
+    """Queue the job for an immediate tick; coalesces with a pending or running one."""
+    with _emit_cond:
+        if state.running:
+            state.signalled = True
+        elif not state.ready:
+            state.ready = True
+            _emit_ready.append(state)
+            _emit_cond.notify()
+
+
+def _schedule_heartbeat(state: _EmitterState) -> None:
+    # Caller holds _emit_cond.
+    seq = next(_emit_seq)
+    state.heartbeat_seq = seq
+    due_ns = time.monotonic_ns() + int(EMIT_HEARTBEAT_SECONDS * 1_000_000_000)
+    heapq.heappush(_emit_heartbeats, (due_ns, seq, state))
+    _emit_cond.notify()
+
+
+def _next_emit_state() -> _EmitterState:
+    """Block until some job has signalled or its heartbeat is due, and claim it."""
+    with _emit_cond:
+        while True:
+            if _emit_ready:
+                state = _emit_ready.popleft()
+                state.ready = False
+                break
+            while _emit_heartbeats and _emit_heartbeats[0][1] != _emit_heartbeats[0][2].heartbeat_seq:
+                heapq.heappop(_emit_heartbeats)
+            if _emit_heartbeats:
+                remaining_ns = _emit_heartbeats[0][0] - time.monotonic_ns()
+                if remaining_ns <= 0:
+                    state = heapq.heappop(_emit_heartbeats)[2]
+                    break
+                _emit_cond.wait(remaining_ns / 1_000_000_000)
+            else:
+                _emit_cond.wait()
+        state.heartbeat_seq = None
+        state.running = True
+        return state
+
+
+def _emitter_worker() -> None:
+    while True:
+        state = _next_emit_state()
+        alive = _emit_tick(state)
+        with _emit_cond:
+            state.running = False
+            if alive and state.signalled:
+                state.signalled = False
+                state.ready = True
+                _emit_ready.append(state)
+                _emit_cond.notify()
+            elif alive:
+                _schedule_heartbeat(state)
+        if not alive:
+            state.job.progress_listener = None
+            with _active_emitters_lock:
+                _active_emitters.discard(state.job.job_id)
+
+
+def _ensure_emitter_workers() -> None:
+    global _emitter_workers_started
+    with _active_emitters_lock:
+        if _emitter_workers_started:
+            return
+        _emitter_workers_started = True
+    for i in range(EMITTER_WORKERS):
+        threading.Thread(target=_emitter_worker, name=f"job-emitter-{i}", daemon=True).start()
 
-        with job_emitters_lock:
-            job_emitters.pop(job.job_id, None)
 
-    t = threading.Thread(target=_run, daemon=True)
-    with job_emitters_lock:
-        job_emitters[job.job_id] = t
-    t.start()
+def _start_job_emitter(job: DownloadJob, download_folder: str) -> None:
+    with _active_emitters_lock:
+        if job.job_id in _active_emitters:
+            return
+        _active_emitters.add(job.job_id)
+    _ensure_emitter_workers()
+    state = _EmitterState(job, download_folder)
+    job.progress_listener = lambda: _signal_emit(state)
+    _signal_emit(state)
 
 def run_download_job(job: DownloadJob, download_folder):
     """Execute the download job in a separate thread"""
@@ -296,7 +541,8 @@ def run_download_job(job: DownloadJob, download_folder):
                 job.status = "downloading"
                 job.add_log("INFO", f"Using plugin backend: {getattr(plugin, 'SITE_NAME', plugin.__class__.__name__)}")
                 generic_out = os.path.join(download_folder, "plugin_downloads")
-                result = plugin_manager.download(
+                # One extractor pass yields both the files and the title for the job.
+                result = plugin_manager.extract_and_download(
                     job.anime_url,
                     generic_out,
                     quality=job.config.get("quality"),
@@ -317,16 +563,18 @@ def run_download_job(job: DownloadJob, download_folder):
                 job.status = "completed"
                 job.end_time = datetime.now()
                 job.add_log("INFO", f"🎉 Plugin download completed ({len(files)} file(s))")
-                _persist_job(job)
+                _persist_job(job, durable=True)
+                job.signal_progress()
                 return
 
         # Initialize downloader
-        downloader = AnimeDownloader(config={
+        downloader_config = {
             "download_method": job.config.get("download_method", "yt-dlp"),
             "max_retries": job.config.get("max_retries", 7),
             "timeout": job.config.get("timeout", 300),
             "max_workers": job.config.get("max_workers", 15),
-        })
+        }
+        downloader = AnimeDownloader(config=downloader_config)
 
         # Set up callbacks
         def log_callback(level, msg):
@@ -368,14 +616,10 @@ def run_download_job(job: DownloadJob, download_folder):
         elif download_mode == "Episode Range":
             start_ep = job.config.get("start_episode", "1")
             end_ep = job.config.get("end_episode", "1")
-            
-            def in_range(ep_id, start_id, end_id):
-                start_key = downloader.safe_episode_key(start_id)
-                end_key = downloader.safe_episode_key(end_id)
-                key = downloader.safe_episode_key(ep_id)
-                return start_key <= key <= end_key
-            
-            selected = [ep for ep in episodes if in_range(ep["id"], start_ep, end_ep)]
+
+            start_key = downloader.safe_episode_key(start_ep)
+            end_key = downloader.safe_episode_key(end_ep)
+            selected = [ep for ep in episodes if start_key <= downloader.safe_episode_key(ep["id"]) <= end_key]
         else:  # All Episodes
             selected = episodes
 
@@ -395,55 +639,84 @@ def run_download_job(job: DownloadJob, download_folder):
         prefer_type = job.config.get("prefer_type", "Soft Sub")
         prefer_server = job.config.get("prefer_server", "Server 1")
 
-        for idx, ep in enumerate(selected, 1):
-            ep_id = ep["id"]
-            job.current_episode = ep_id
-            job.add_log("INFO", f"Processing episode {ep_id} ({idx}/{job.total_episodes})")
-
-            # Get servers
-            servers = downloader.get_video_servers(ep["token"])
+        # The scraper session is not thread-safe, so every resolve worker gets
+        # its own downloader instead of sharing the one download_episode uses.
+        resolver_local = threading.local()
+
+        def resolver_downloader():
+            resolver = getattr(resolver_local, "downloader", None)
+            if resolver is None:
+                resolver = AnimeDownloader(config=downloader_config)
+                resolver.set_log_callback(log_callback)
+                resolver_local.downloader = resolver
+            return resolver
+
+        def resolve_episode(ep):
+            """Look up the server and video data for one episode; returns (server, video_data, error)."""
+            resolver = resolver_downloader()
+            servers = resolver.get_video_servers(ep["token"])
             if not servers:
-                job.add_log("ERROR", f"No servers available for episode {ep_id}")
-                continue
-
-            # Choose server
-            server = downloader.choose_server(servers, prefer_type, prefer_server)
+                return None, None, f"No servers available for episode {ep['id']}"
+            server = resolver.choose_server(servers, prefer_type, prefer_server)
             if not server:
-                job.add_log("ERROR", f"Could not choose server for episode {ep_id}")
-                continue
-
-            job.add_log("INFO", f"Using server: {server['server_name']}")
-
-            # Get video data
-            video_data = downloader.get_video_data(server["server_id"])
+                return None, None, f"Could not choose server for episode {ep['id']}"
+            video_data = resolver.get_video_data(server["server_id"])
             if not video_data:
-                job.add_log("ERROR", f"Could not resolve video data for episode {ep_id}")
-                continue
-
-            # Generate filename
-            filename = downloader.generate_episode_filename(anime_title, job.season, ep_id)
-            filepath = os.path.join(download_dir, filename)
-            job.current_file = os.path.basename(filepath)
-
-            # Download episode
-            if downloader.download_episode(
-                video_data,
-                filepath,
-                ep_id,
-                quality=job.config.get("quality"),
-                fps=job.config.get("fps"),
-            ):
-                downloaded_files.append(filepath)
-                job.completed_episodes += 1
-                job.progress = int((job.completed_episodes / job.total_episodes) * 100)
-                job.downloaded_files.append(os.path.basename(filepath))
-                job.current_file = None
-                job.add_log("INFO", f"✅ Successfully downloaded episode {ep_id}")
-                _persist_job(job)
-            else:
-                job.current_file = None
-                job.add_log("ERROR", f"❌ Failed to download episode {ep_id}")
-                _persist_job(job)
+                return server, None, f"Could not resolve video data for episode {ep['id']}"
+            return server, video_data, None
+
+        # Resolve metadata a few episodes ahead while the current one downloads.
+        # The lookahead is bounded so stream URLs don't expire before their turn.
+        lookahead = max(1, min(EPISODE_PREFETCH_WORKERS, int(job.config.get("max_workers") or EPISODE_PREFETCH_WORKERS)))
+        resolve_pool = ThreadPoolExecutor(max_workers=lookahead, thread_name_prefix=f"job{job.job_id}-resolve")
+        pending = {}
+        try:
+            for idx, ep in enumerate(selected, 1):
+                for ahead in selected[idx - 1:idx - 1 + lookahead]:
+                    if id(ahead) not in pending:
+                        pending[id(ahead)] = resolve_pool.submit(resolve_episode, ahead)
+
+                ep_id = ep["id"]
+                job.current_episode = ep_id
+                job.add_log("INFO", f"Processing episode {ep_id} ({idx}/{job.total_episodes})")
+
+                server, video_data, error = pending.pop(id(ep)).result()
+                if server:
+                    job.add_log("INFO", f"Using server: {server['server_name']}")
+                if error:
+                    job.add_log("ERROR", error)
+                    continue
+
+                # Generate filename
+                filename = downloader.generate_episode_filename(anime_title, job.season, ep_id)
+                filepath = os.path.join(download_dir, filename)
+                job.current_file = os.path.basename(filepath)
+                job.signal_progress()
+
+                # Download episode
+                if downloader.download_episode(
+                    video_data,
+                    filepath,
+                    ep_id,
+                    quality=job.config.get("quality"),
+                    fps=job.config.get("fps"),
+                ):
+                    downloaded_files.append(filepath)
+                    job.completed_episodes += 1
+                    job.progress = int((job.completed_episodes / job.total_episodes) * 100)
+                    job.downloaded_files.append(os.path.basename(filepath))
+                    job.current_file = None
+                    job.add_log("INFO", f"✅ Successfully downloaded episode {ep_id}")
+                    _persist_job(job)
+                else:
+                    job.current_file = None
+                    job.add_log("ERROR", f"❌ Failed to download episode {ep_id}")
+                    _persist_job(job)
+                job.signal_progress()
+        finally:
+            for future in pending.values():
+                future.cancel()
+            resolve_pool.shutdown(wait=False)
 
         # Merge if requested and multiple episodes
         merge_episodes = job.config.get("merge_episodes", False)
@@ -484,12 +757,15 @@ def run_download_job(job: DownloadJob, download_folder):
         job.current_file = None
         job.end_time = datetime.now()
         job.add_log("INFO", f"🎉 Download job completed! Downloaded {job.completed_episodes}/{job.total_episodes} episodes")
-        _persist_job(job)
+        _persist_job(job, durable=True)
+        job.signal_progress()
 
     except Exception as e:
         job.status = "failed"
         job.error = str(e)
         job.failure_reason = str(e)
+        # The error feeds the failure blob, so drop any blob memoized before it was set.
+        job.touch()
         job.failure_category = _categorize_failure(job)
         job.recovery_plan = _build_recovery_plan(job)
         job.current_file = None
@@ -497,7 +773,8 @@ def run_download_job(job: DownloadJob, download_folder):
         job.add_log("ERROR", f"Job failed: {e}")
         import traceback
         job.add_log("ERROR", traceback.format_exc())
-        _persist_job(job)
+        _persist_job(job, durable=True)
+        job.signal_progress()
 
 @download_bp.route('/anime/info', methods=['POST'])
 @login_required
@@ -536,8 +813,6 @@ def get_anime_info():
 @login_required
 def start_download():
     """Start a new download job"""
-    global job_counter
-    
     try:
         data = request.json
         anime_url = data.get('anime_url')
@@ -588,7 +863,7 @@ def start_download():
 @login_required
 def get_download_status(job_id):
     """Get status of a download job"""
-    job = download_jobs.get(job_id)
+    job = _lookup_job(job_id)
     
     if not job:
         return jsonify({"error": "Job not found"}), 404
@@ -598,20 +873,37 @@ def get_download_status(job_id):
 @download_bp.route('/list', methods=['GET'])
 @login_required
 def list_downloads():
-    """List all download jobs"""
-    jobs = [job.to_dict() for job in download_jobs.values()]
-    # Sort by start time, newest first
-    jobs.sort(key=lambda x: x['start_time'], reverse=True)
+    """List download jobs, newest first.
+
+    Without arguments this returns the resident jobs. ``?limit=&offset=`` pages
+    through the full history in SQLite instead, preferring the live in-memory
+    copy of any job that is still resident.
+    """
+    if "limit" in request.args or "offset" in request.args:
+        limit = max(1, min(request.args.get("limit", MAX_RESIDENT_JOBS, type=int), 1000))
+        offset = max(0, request.args.get("offset", 0, type=int))
+        jobs = []
+        for row in job_store.load_jobs_page(limit, offset):
+            job = download_jobs.get(row["job_id"])
+            jobs.append(job.to_dict_cached() if job is not None else _job_from_row(row).to_dict())
+        return jsonify(jobs)
+
+    # Jobs are inserted in id order, which is start order, so newest first is reverse insertion.
+    with _download_jobs_lock:
+        resident = list(download_jobs.values())
+    jobs = [job.to_dict_cached() for job in reversed(resident)]
     return jsonify(jobs)
 
 @download_bp.route('/clear/<int:job_id>', methods=['DELETE'])
 @login_required
 def clear_download_job(job_id):
     """Clear a completed/failed job from history"""
-    if job_id in download_jobs:
-        job = download_jobs[job_id]
+    job = _lookup_job(job_id)
+    if job:
         if job.status in ["completed", "failed"]:
-            del download_jobs[job_id]
+            with _download_jobs_lock:
+                download_jobs.pop(job_id, None)
+            job_writer.discard(job_id)
             job_store.delete_job(job_id)
             return jsonify({"message": "Job cleared"})
         else:
@@ -619,6 +911,25 @@ def clear_download_job(job_id):
     return jsonify({"error": "Job not found"}), 404
 
 
+@download_bp.route('/clear-completed', methods=['DELETE'])
+@login_required
+def clear_completed_downloads():
+    """Clear every completed/failed job from history, resident or evicted"""
+    with _download_jobs_lock:
+        finished = [job_id for job_id, job in download_jobs.items() if job.status in {"completed", "failed"}]
+        for job_id in finished:
+            del download_jobs[job_id]
+    # Evicted jobs only exist in the store; resident ones are deleted by id in
+    # case their final state has not reached the store yet.
+    cleared = set(finished)
+    cleared.update(job_store.delete_finished_jobs())
+    for job_id in cleared:
+        job_writer.discard(job_id)
+    job_store.delete_jobs_bulk(finished)
+    cleared_ids = sorted(cleared)
+    return jsonify({"message": f"Cleared {len(cleared_ids)} job(s)", "cleared": cleared_ids})
+
+
 @download_bp.route('/plugins', methods=['GET'])
 @login_required
 def list_plugins():
@@ -630,7 +941,7 @@ def list_plugins():
 @login_required
 def retry_download_job(job_id):
     """Create a new job using Download Doctor recovery suggestions."""
-    old_job = download_jobs.get(job_id)
+    old_job = _lookup_job(job_id)
     if not old_job:
         return jsonify({"error": "Job not found"}), 404
     if old_job.status != "failed":
@@ -678,3 +989,5 @@ def retry_download_job(job_id):
 
 
 _hydrate_jobs_from_store()
+# next() on a count is atomic under the GIL, so id allocation needs no lock.
+_job_id_iter = itertools.count(job_store.get_max_job_id() + 1)
@@ -128,6 +128,19 @@ socket.on('job_update', (job) => {
     const idx = lastJobs.findIndex(j => j.job_id === job.job_id);
     if (idx >= 0) lastJobs[idx] = job;
     else lastJobs.unshift(job);
+    renderActiveJobs();
+});
+
+// Deltas carry only the fields that changed; merge them onto the cached job.
+socket.on('job_delta', (delta) => {
+    if (!delta || !delta.job_id) return;
+    const job = lastJobs.find(j => j.job_id === delta.job_id);
+    if (!job) return;
+    Object.assign(job, delta);
+    renderActiveJobs();
+});
+
+function renderActiveJobs() {
     // lightweight refresh of counts + active list
     try {
         const activeJobs = lastJobs.filter(d =>
@@ -161,7 +174,7 @@ socket.on('job_update', (job) => {
     } catch (e) {
         console.error(e);
     }
-});
+}
 
 // Load dashboard on page load
 loadDashboard();
@@ -0,0 +1,6 @@
+import os
+import tempfile
+
+# Importing the app package runs create_app(), which creates the download folder
+# and the job database inside it; keep both out of the working tree.
+os.environ.setdefault("DOWNLOAD_FOLDER", tempfile.mkdtemp(prefix="ani-downloader-tests-"))
@@ -0,0 +1,57 @@
+import os
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+from unittest import mock
+
+from app.models import DownloadJob
+from app.routes import download
+
+
+class EmitterTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.finished = {}
+        self.lock = threading.Lock()
+
+        def emit(event, data):
+            if event == "job_update" and data.get("status") == "completed":
+                with self.lock:
+                    self.finished.setdefault(data["job_id"], time.monotonic())
+
+        for target, value in (("_persist_job", lambda job, durable=None: None), ("socketio", mock.Mock(emit=emit))):
+            patcher = mock.patch.object(download, target, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def test_signal_is_seen_with_more_jobs_than_workers(self):
+        jobs = [DownloadJob(1000 + i, "u", {}) for i in range(download.EMITTER_WORKERS * 3)]
+        for job in jobs:
+            job.status = "downloading"
+            download._start_job_emitter(job, self.tmp)
+        time.sleep(0.1)
+
+        last = jobs[-1]
+        last.status = "completed"
+        signalled_at = time.monotonic()
+        last.signal_progress()
+
+        deadline = signalled_at + 5
+        while last.job_id not in self.finished and time.monotonic() < deadline:
+            time.sleep(0.01)
+        for job in jobs[:-1]:
+            job.status = "completed"
+            job.signal_progress()
+
+        self.assertIn(last.job_id, self.finished)
+        # Well under one heartbeat: the signal woke a worker rather than waiting for a poll.
+        self.assertLess(self.finished[last.job_id] - signalled_at, download.EMIT_HEARTBEAT_SECONDS / 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,66 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from app.job_store import JobStore
+
+
+class JobStoreTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.store = JobStore(os.path.join(self.tmp, "db", "jobs.sqlite3"))
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def test_round_trip(self):
+        config = {"quality": "1080", "merge_episodes": True}
+        state = {"status": "downloading", "start_time": "2024-01-01T00:00:00", "progress": 40, "title": "Ōkami"}
+        self.store.upsert_job(7, "https://anikai.to/watch/x", config, state)
+
+        job = self.store.load_job(7)
+        self.assertEqual(job["job_id"], 7)
+        self.assertEqual(job["anime_url"], "https://anikai.to/watch/x")
+        self.assertEqual(job["config"], config)
+        self.assertEqual(job["state"], state)
+
+    def test_upsert_replaces_state(self):
+        self.store.upsert_job(1, "u", {}, {"status": "downloading"})
+        self.store.upsert_job(1, "u", {}, {"status": "completed"})
+        self.assertEqual(self.store.load_job(1)["state"], {"status": "completed"})
+
+    def test_missing_job(self):
+        self.assertIsNone(self.store.load_job(404))
+
+    def test_reopen_keeps_rows(self):
+        self.store.upsert_job(5, "u", {"a": 1}, {"status": "completed"})
+        reopened = JobStore(self.store.db_path)
+        self.assertEqual(reopened.load_job(5)["config"], {"a": 1})
+
+
+    def test_max_job_id_tracks_upserts_and_reopen(self):
+        self.assertEqual(self.store.get_max_job_id(), 0)
+        self.store.upsert_jobs([(3, "u", {}, {}), (9, "u", {}, {})])
+        self.store.upsert_job(4, "u", {}, {})
+        self.assertEqual(self.store.get_max_job_id(), 9)
+        self.assertEqual(JobStore(self.store.db_path).get_max_job_id(), 9)
+
+
+    def test_delete_finished_jobs(self):
+        self.store.upsert_jobs([
+            (1, "u", {}, {"status": "completed", "start_time": "2024"}),
+            (2, "u", {}, {"status": "downloading", "start_time": "2025"}),
+            (3, "u", {}, {"status": "failed", "start_time": "2026"}),
+        ])
+        self.assertEqual(sorted(self.store.delete_finished_jobs()), [1, 3])
+        self.assertEqual([j["job_id"] for j in self.store.load_jobs()], [2])
+
+    def test_delete_jobs_bulk(self):
+        self.store.upsert_jobs([(i, "u", {}, {"status": "queued"}) for i in range(1, 4)])
+        self.store.delete_jobs_bulk([1, 3])
+        self.assertEqual([j["job_id"] for j in self.store.load_jobs()], [2])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,78 @@
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+
+from app.job_store import JobStore
+from app.job_store_writer import BufferedJobWriter
+
+
+class BufferedJobWriterTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.store = JobStore(os.path.join(self.tmp, "jobs.sqlite3"))
+        self.writer = BufferedJobWriter(self.store, interval=0.01)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def test_flush_writes_latest_state(self):
+        self.writer.schedule_upsert(1, "u", {}, {"status": "downloading"}, 1)
+        self.writer.schedule_upsert(1, "u", {}, {"status": "merging"}, 2)
+        self.writer.flush_now(1)
+        self.assertEqual(self.store.load_job(1)["state"], {"status": "merging"})
+
+    def test_background_flush(self):
+        self.writer.schedule_upsert(1, "u", {"q": 1}, {"status": "queued"}, 1)
+        for _ in range(500):
+            if self.store.load_job(1) is not None:
+                break
+            threading.Event().wait(0.01)
+        job = self.store.load_job(1)
+        self.assertEqual((job["config"], job["state"]), ({"q": 1}, {"status": "queued"}))
+
+    def test_discard_drops_pending_write(self):
+        self.writer.schedule_upsert(1, "u", {}, {"status": "queued"}, 1)
+        self.writer.discard(1)
+        self.writer.flush_now(1)
+        self.assertIsNone(self.store.load_job(1))
+
+
+    def test_older_snapshot_is_dropped(self):
+        self.writer.schedule_upsert(1, "u", {}, {"status": "completed"}, 5)
+        self.writer.flush_now()
+        self.writer.schedule_upsert(1, "u", {}, {"status": "downloading"}, 4)
+        self.writer.flush_now()
+        self.assertEqual(self.store.load_job(1)["state"], {"status": "completed"})
+
+    def test_terminal_state_wins_over_stale_dirty_row(self):
+        # A dirty-source sweep snapshots the job mid-download, then stalls while the
+        # job thread persists its terminal state. The stale row must not land last.
+        collected = threading.Event()
+        release = threading.Event()
+
+        def stale_source():
+            collected.set()
+            release.wait(5)
+            yield (1, "u", {}, {"status": "downloading"}, 1)
+
+        self.writer.add_dirty_source(stale_source)
+        self.assertTrue(collected.wait(5))
+
+        def finish():
+            self.writer.schedule_upsert(1, "u", {}, {"status": "completed"}, 2)
+            self.writer.flush_now(1)
+
+        finisher = threading.Thread(target=finish)
+        finisher.start()
+        finisher.join(0.05)
+        release.set()
+        finisher.join(5)
+        self.writer.flush_now()
+
+        self.assertEqual(self.store.load_job(1)["state"], {"status": "completed"})
+
+
+if __name__ == "__main__":
+    unittest.main()
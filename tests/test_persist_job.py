@@ -0,0 +1,63 @@
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+from datetime import datetime
+from unittest import mock
+
+from app.job_store import JobStore
+from app.job_store_writer import BufferedJobWriter
+from app.models import DownloadJob
+from app.routes import download
+
+
+class _PausingJob(DownloadJob):
+    """Pauses inside the next to_dict() call, after its snapshot has been built."""
+
+    pause = None
+
+    def to_dict(self):
+        data = super().to_dict()
+        gate, self.pause = self.pause, None
+        if gate is not None:
+            taken, release = gate
+            taken.set()
+            release.wait(5)
+        return data
+
+
+class PersistJobTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.store = JobStore(os.path.join(self.tmp, "jobs.sqlite3"))
+        patcher = mock.patch.object(download, "job_writer", BufferedJobWriter(self.store, interval=0.01))
+        self.writer = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def test_terminal_persist_wins_over_concurrent_progress_persist(self):
+        job = _PausingJob(1, "u", {})
+        job.status = "downloading"
+        taken, release = threading.Event(), threading.Event()
+        job.pause = (taken, release)
+
+        progress = threading.Thread(target=download._persist_job, args=(job,), kwargs={"durable": False})
+        progress.start()
+        self.assertTrue(taken.wait(5))
+
+        # The "downloading" snapshot is built; the job finishes before it is queued.
+        job.status = "completed"
+        job.end_time = datetime.now()
+        download._persist_job(job)
+        release.set()
+        progress.join(5)
+        self.writer.flush_now()
+
+        self.assertEqual(self.store.load_job(1)["state"]["status"], "completed")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,89 @@
+import unittest
+
+from app.plugin_manager import PluginManager
+from app.plugins.animekai_plugin import AnimeKaiPlugin
+from app.plugins.generic_plugin import GenericPlugin
+from app.plugins.gogoanime_plugin import GogoAnimePlugin
+from app.plugins.hianime_plugin import HiAnimePlugin
+from app.plugins.nineanime_plugin import NineAnimePlugin
+
+
+class CanHandleTest(unittest.TestCase):
+    CASES = [
+        (
+            AnimeKaiPlugin,
+            ["https://anikai.to/watch/one-piece-100", "http://www.anikai.to/", "https://anikai.to/watch/x?ep=3"],
+            ["https://anikai.com/watch/x", "https://notanikai.to/watch/x", "ftp://anikai.to/x"],
+        ),
+        (
+            GogoAnimePlugin,
+            [
+                "https://gogoanime.io/naruto-episode-1",
+                "https://www.gogoanime3.co/category/naruto",
+                "https://goload.pro/streaming.php?id=1",
+            ],
+            ["https://gogoanime.io/", "https://gogoanime.net/naruto", "https://example.com/gogoanime.io/x"],
+        ),
+        (
+            HiAnimePlugin,
+            ["https://hianime.to/watch/naruto-677?ep=12345", "https://aniwatch.tv/naruto-677"],
+            ["https://hianime.to/", "https://hianime.com/watch/x"],
+        ),
+        (
+            NineAnimePlugin,
+            ["https://9anime.to/watch/naruto.xx8z", "https://www.9anime.gg/watch/x"],
+            ["https://9anime.com/watch/x", "https://9anime.to/"],
+        ),
+    ]
+
+    def test_site_plugins(self):
+        for cls, accepted, rejected in self.CASES:
+            plugin = cls()
+            for url in accepted:
+                with self.subTest(plugin=cls.__name__, url=url):
+                    self.assertTrue(plugin.can_handle(url))
+            for url in rejected:
+                with self.subTest(plugin=cls.__name__, url=url):
+                    self.assertFalse(plugin.can_handle(url))
+
+    def test_prefix_match_allows_trailing_text(self):
+        # Patterns use re.match semantics: they must match at the start, not the whole URL.
+        self.assertTrue(HiAnimePlugin().can_handle("https://hianime.to/watch/x trailing"))
+
+    def test_instance_url_patterns_override_class(self):
+        plugin = NineAnimePlugin.__new__(NineAnimePlugin)
+        plugin.URL_PATTERNS = [r"https?://mirror\.example/.+"]
+        NineAnimePlugin.__init__(plugin)
+        self.assertTrue(plugin.can_handle("https://mirror.example/watch/x"))
+        self.assertFalse(plugin.can_handle("https://9anime.to/watch/x"))
+
+    def test_generic_handles_everything(self):
+        self.assertTrue(GenericPlugin().can_handle("https://example.com/video"))
+
+
+class DispatchTest(unittest.TestCase):
+    def test_urls_route_to_site_plugins(self):
+        manager = PluginManager()
+        expected = {
+            "https://anikai.to/watch/x": "AniKai.to",
+            "https://gogoanime.io/naruto-episode-1": "GogoAnime",
+            "https://hianime.to/watch/naruto-677": "HiAnime (Aniwatch)",
+            "https://9anime.to/watch/x": "9anime",
+            "https://example.com/video": GenericPlugin.SITE_NAME,
+        }
+        for _ in range(2):  # the second pass is served from the dispatch cache
+            for url, site in expected.items():
+                with self.subTest(url=url):
+                    self.assertEqual(manager.get_plugin_for_url(url).SITE_NAME, site)
+
+    def test_clear_dispatch_cache_sees_plugin_changes(self):
+        manager = PluginManager()
+        url = "https://hianime.to/watch/naruto-677"
+        self.assertIsInstance(manager.get_plugin_for_url(url), HiAnimePlugin)
+        manager.plugins = [p for p in manager.plugins if not isinstance(p, HiAnimePlugin)]
+        manager.clear_dispatch_cache()
+        self.assertIs(manager.get_plugin_for_url(url), manager.fallback_plugin)
+
+
+if __name__ == "__main__":
+    unittest.main()
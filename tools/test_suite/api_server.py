@@ -1,32 +1,85 @@
 from __future__ import annotations
 
+import json
 import os
-from typing import Any, Dict, List
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Dict, List, Optional
 
-from flask import Flask, jsonify, request
+from flask import Flask, Response, request, stream_with_context
 
-from app.plugin_manager import PluginManager
+from app.plugin_manager import PLUGIN_MANAGER
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
-def _json_error(message: str, status_code: int = 400, *, details: Any = None):
+MAX_BATCH_CONCURRENCY = 16
+BATCH_CHUNK_SIZE = 4
+INFO_CACHE_SIZE = 256
+
+
+def _episode_number(ep: Dict[str, Any]) -> Optional[int]:
+    """Episode number coerced with int(), or None when it is missing or not numeric."""
+    try:
+        return int(ep.get("episode_number"))
+    except (TypeError, ValueError):
+        return None
+
+
+def _dumps(obj: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, separators=(",", ":")).encode("utf-8")
+
+
+def _json(payload: Any, status_code: int = 200) -> Response:
+    return Response(_dumps(payload), status=status_code, mimetype="application/json")
+
+
+def _json_error(message: str, status_code: int = 400, *, details: Any = None) -> Response:
     payload: Dict[str, Any] = {"success": False, "error": message}
     if details is not None:
         payload["details"] = details
-    return jsonify(payload), status_code
+    return _json(payload, status_code)
 
 
 def create_test_app() -> Flask:
     app = Flask(__name__)
 
-    plugin_manager = PluginManager()
+    plugin_manager = PLUGIN_MANAGER
+
+    # The plugin set is fixed once the manager is built, so both bodies are encoded once.
+    health_json = b'{"ok":true}'
+    plugins_json = _dumps({"success": True, "plugins": plugin_manager.list_plugins()})
 
     @app.get("/health")
     def health():
-        return jsonify({"ok": True})
+        return Response(health_json, mimetype="application/json")
 
     @app.get("/api/plugins")
     def list_plugins():
-        return jsonify({"success": True, "plugins": plugin_manager.list_plugins()})
+        return Response(plugins_json, mimetype="application/json")
+
+    # Repeat /api/info calls for the same URL are answered from memory; ?fresh=1 bypasses.
+    info_results: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+    info_lock = threading.Lock()
+
+    def _cached_info(url: str) -> Optional[Dict[str, Any]]:
+        with info_lock:
+            info = info_results.get(url)
+            if info is not None:
+                info_results.move_to_end(url)
+            return info
+
+    def _remember_info(url: str, info: Dict[str, Any]) -> None:
+        with info_lock:
+            info_results[url] = info
+            info_results.move_to_end(url)
+            while len(info_results) > INFO_CACHE_SIZE:
+                info_results.popitem(last=False)
 
     @app.post("/api/info")
     def extract_info():
@@ -35,8 +88,14 @@ def create_test_app() -> Flask:
         if not url:
             return _json_error("url is required", 400)
 
-        info = plugin_manager.extract_info(url)
-        return jsonify({"success": True, "info": info})
+        fresh = request.args.get("fresh") in {"1", "true", "yes"}
+        info = None if fresh else _cached_info(url)
+        if info is None:
+            info = plugin_manager.extract_info(url, refresh=fresh)
+            # Failures aren't cached so the next call retries the extraction.
+            if "error" not in info:
+                _remember_info(url, info)
+        return _json({"success": True, "info": info})
 
     @app.post("/api/download")
     def download_single():
@@ -50,8 +109,7 @@ def create_test_app() -> Flask:
         fmt = data.get("format")
 
         result = plugin_manager.download(url, download_folder, quality=quality, format=fmt)
-        status = 200 if result.get("success") else 500
-        return jsonify(result), status
+        return _json(result, 200 if result.get("success") else 500)
 
     @app.post("/api/batch-download")
     def batch_download():
@@ -81,29 +139,68 @@ def create_test_app() -> Flask:
         requested = data.get("episodes")
         if requested:
             requested_set = set(int(x) for x in requested)
-            episode_list = [
-                ep for ep in episode_list if int(ep.get("episode_number")) in requested_set
-            ]
-
-        results: List[Dict[str, Any]] = []
-        for ep in episode_list:
-            ep_url = ep.get("url")
-            ep_num = ep.get("episode_number")
-            if not ep_url:
-                results.append({"episode": ep_num, "success": False, "error": "missing url"})
-                continue
-
-            r = plugin_manager.download(ep_url, download_folder, quality=quality, format=fmt)
-            results.append(
-                {
-                    "episode": ep_num,
-                    "success": bool(r.get("success")),
-                    "files": r.get("files", []),
-                    "error": r.get("error"),
-                }
-            )
+            episode_list = [ep for ep in episode_list if _episode_number(ep) in requested_set]
 
-        return jsonify({"success": True, "results": results})
+        try:
+            concurrency = int(data.get("concurrency", 4))
+        except (TypeError, ValueError):
+            return _json_error("concurrency must be an integer", 400)
+        concurrency = max(1, min(concurrency, MAX_BATCH_CONCURRENCY))
+
+        # Episodes go out in small chunks, each a single download_many call so the
+        # plugin can still share its session; the episodes came from ``plugin``, so
+        # it is passed along instead of re-dispatching every URL.
+        with_url = [(i, ep) for i, ep in enumerate(episode_list) if ep.get("url")]
+        chunks = [with_url[i:i + BATCH_CHUNK_SIZE] for i in range(0, len(with_url), BATCH_CHUNK_SIZE)]
+
+        def _results():
+            """Yield (index into episode_list, result) pairs as chunks finish."""
+            for i, ep in enumerate(episode_list):
+                if not ep.get("url"):
+                    yield i, {"episode": ep.get("episode_number"), "success": False, "error": "missing url"}
+            if not chunks:
+                return
+            with ThreadPoolExecutor(max_workers=min(concurrency, len(chunks))) as ex:
+                futs = {
+                    ex.submit(
+                        plugin_manager.download_many,
+                        [ep["url"] for _, ep in chunk],
+                        download_folder,
+                        plugin=plugin,
+                        quality=quality,
+                        format=fmt,
+                    ): chunk
+                    for chunk in chunks
+                }
+                for fut in as_completed(futs):
+                    chunk = futs[fut]
+                    try:
+                        downloaded = fut.result()
+                    except Exception as e:
+                        downloaded = [{"success": False, "files": [], "error": str(e)} for _ in chunk]
+                    for (i, ep), r in zip(chunk, downloaded):
+                        yield i, {
+                            "episode": ep.get("episode_number"),
+                            "success": bool(r.get("success")),
+                            "files": r.get("files", []),
+                            "error": r.get("error"),
+                        }
+
+        # Clients that send "Accept: application/x-ndjson" get one line per episode as
+        # soon as it finishes (completion order, with its "index" in the episode list),
+        # then a {"done": true} summary. Everyone else gets the usual JSON body.
+        if "application/x-ndjson" in request.headers.get("Accept", ""):
+            def generate():
+                for i, result in _results():
+                    yield _dumps({"index": i, **result}) + b"\n"
+                yield _dumps({"done": True, "count": len(episode_list)}) + b"\n"
+
+            return Response(stream_with_context(generate()), mimetype="application/x-ndjson")
+
+        results: List[Optional[Dict[str, Any]]] = [None] * len(episode_list)
+        for i, result in _results():
+            results[i] = result
+        return _json({"success": True, "results": results})
 
     @app.errorhandler(404)
     def not_found(_e):
@@ -118,7 +215,13 @@ def create_test_app() -> Flask:
 
 def main() -> None:
     app = create_test_app()
-    app.run(debug=True, host="127.0.0.1", port=5050)
+    try:
+        from waitress import serve
+    except ImportError:
+        # Werkzeug's threaded server still handles requests concurrently.
+        app.run(host="127.0.0.1", port=5050, threaded=True)
+        return
+    serve(app, host="127.0.0.1", port=5050, threads=16)
 
 
 if __name__ == "__main__":
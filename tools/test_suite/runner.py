@@ -1,18 +1,33 @@
 from __future__ import annotations
 
+import asyncio
+import io
+import json
 import os
 import sys
 import time
 import signal
+import socket
 import subprocess
+import tempfile
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from dataclasses import dataclass, field
+from functools import partial
 from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
 
 import requests
+from requests.adapters import HTTPAdapter
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
 
 
 BASE_URL = os.environ.get("PLUGIN_TEST_BASE_URL", "http://127.0.0.1:5050")
 SERVER_START_CMD = [sys.executable, os.path.join("scripts", "test_plugin_app.py")]
+SERVER_LOG_PATH = os.path.join(tempfile.gettempdir(), "plugin_test_server.log")
 
 TEST_INFO_URL = os.environ.get("PLUGIN_TEST_INFO_URL", "https://gogoanime.io/one-piece-episode-1075")
 TEST_DOWNLOAD_URL = os.environ.get("PLUGIN_TEST_DOWNLOAD_URL", "")
@@ -21,20 +36,33 @@ TEST_SERIES_URL = os.environ.get("PLUGIN_TEST_SERIES_URL", "https://gogoanime.io
 ATTEMPTS_PER_FEATURE = int(os.environ.get("PLUGIN_TEST_ATTEMPTS", "5"))
 TIMEOUT_SECONDS = float(os.environ.get("PLUGIN_TEST_TIMEOUT", "10"))
 
+# Shared keep-alive session; probes from every feature run concurrently through it.
+SESSION = requests.Session()
+SESSION.mount("http://", HTTPAdapter(pool_connections=8, pool_maxsize=16))
+SESSION.mount("https://", HTTPAdapter(pool_connections=8, pool_maxsize=16))
+
+
+# stdout doesn't change from tty to pipe mid-run, so check it once.
+_ANSI = sys.stdout.isatty()
+
+_BAR_WIDTH = 28
+_BAR_FULL = "#" * _BAR_WIDTH
+_BAR_EMPTY = "-" * _BAR_WIDTH
 
-def _supports_ansi() -> bool:
-    return sys.stdout.isatty()
+
+RoundCallback = Callable[[List[Tuple[bool, int, str]]], None]
+ProbeCallback = Callable[[int], None]
 
 
 def _c(text: str, code: str) -> str:
-    if not _supports_ansi():
-        return text
-    return f"\x1b[{code}m{text}\x1b[0m"
+    return f"\x1b[{code}m{text}\x1b[0m" if _ANSI else text
 
 
-def _bar(pct: float, width: int = 28) -> str:
+def _bar(pct: float, width: int = _BAR_WIDTH) -> str:
     pct = max(0.0, min(100.0, pct))
     fill = int((pct / 100.0) * width)
+    if width == _BAR_WIDTH:
+        return "[" + _BAR_FULL[:fill] + _BAR_EMPTY[fill:] + "]"
     return "[" + ("#" * fill) + ("-" * (width - fill)) + "]"
 
 
@@ -44,9 +72,13 @@ class FeatureResult:
     attempts: int = 0
     ok: int = 0
     errors: List[str] = field(default_factory=list)
-    last_ms: Optional[float] = None
+    last_ms: Optional[int] = None
+    padded_name: str = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self.padded_name = f"{self.name:<18}"
 
-    def record(self, success: bool, elapsed_ms: float, error: Optional[str] = None) -> None:
+    def record(self, success: bool, elapsed_ms: int, error: Optional[str] = None) -> None:
         self.attempts += 1
         self.last_ms = elapsed_ms
         if success:
@@ -72,23 +104,66 @@ class FeatureResult:
         return "unstable"
 
 
-def _request(method: str, path: str, *, json_body: Optional[Dict[str, Any]] = None) -> Tuple[bool, float, str]:
+def _request(
+    method: str,
+    path: str,
+    *,
+    json_body: Optional[Dict[str, Any]] = None,
+    headers: Optional[Dict[str, str]] = None,
+) -> Tuple[bool, int, str]:
     url = BASE_URL.rstrip("/") + path
-    t0 = time.perf_counter()
+    t0 = time.monotonic_ns()
+    try:
+        r = SESSION.request(method, url, json=json_body, headers=headers, timeout=TIMEOUT_SECONDS)
+        elapsed = (time.monotonic_ns() - t0) // 1_000_000
+        return _evaluate(r.status_code, r.headers.get("Content-Type", ""), r.content, elapsed)
+    except Exception as e:
+        elapsed = (time.monotonic_ns() - t0) // 1_000_000
+        return False, elapsed, str(e)
+
+
+async def _arequest(
+    client: "httpx.AsyncClient",
+    method: str,
+    path: str,
+    *,
+    json_body: Optional[Dict[str, Any]] = None,
+    headers: Optional[Dict[str, str]] = None,
+) -> Tuple[bool, int, str]:
+    t0 = time.monotonic_ns()
     try:
-        r = requests.request(method, url, json=json_body, timeout=TIMEOUT_SECONDS)
-        elapsed = (time.perf_counter() - t0) * 1000.0
-        if 200 <= r.status_code < 300:
-            return True, elapsed, ""
-        snippet = r.text.strip()
-        if len(snippet) > 240:
-            snippet = snippet[:240] + "..."
-        return False, elapsed, f"HTTP {r.status_code}: {snippet}"
+        r = await client.request(method, path, json=json_body, headers=headers)
+        elapsed = (time.monotonic_ns() - t0) // 1_000_000
+        return _evaluate(r.status_code, r.headers.get("Content-Type", ""), r.content, elapsed)
     except Exception as e:
-        elapsed = (time.perf_counter() - t0) * 1000.0
+        elapsed = (time.monotonic_ns() - t0) // 1_000_000
         return False, elapsed, str(e)
 
 
+def _evaluate(status: int, content_type: str, body: bytes, elapsed: int) -> Tuple[bool, int, str]:
+    if 200 <= status < 300:
+        if content_type.startswith("application/x-ndjson"):
+            return _check_ndjson(body, elapsed)
+        return True, elapsed, ""
+    # Decode only the bytes that make it into the snippet, not the whole body.
+    snippet = body[:240].decode("utf-8", errors="replace").strip()
+    if len(body) > 240:
+        snippet += "..."
+    return False, elapsed, f"HTTP {status}: {snippet}"
+
+
+def _check_ndjson(body: bytes, elapsed: int) -> Tuple[bool, int, str]:
+    """A streamed response only counts as complete if it ends with its summary line."""
+    lines = body.strip().splitlines()
+    try:
+        done = bool(lines) and json.loads(lines[-1]).get("done") is True
+    except ValueError:
+        done = False
+    if not done:
+        return False, elapsed, f"stream ended without summary after {len(lines)} line(s)"
+    return True, elapsed, ""
+
+
 def _is_server_alive() -> bool:
     ok, _, _ = _request("GET", "/health")
     return ok
@@ -98,19 +173,31 @@ def _start_server() -> Optional[subprocess.Popen]:
     if _is_server_alive():
         return None
 
-    proc = subprocess.Popen(
-        SERVER_START_CMD,
-        stdout=subprocess.PIPE,
-        stderr=subprocess.STDOUT,
-        text=True,
-        creationflags=subprocess.CREATE_NEW_PROCESS_GROUP if os.name == "nt" else 0,
-    )
+    # Server output goes to a file: nothing reads it during the run, and a full
+    # pipe would block the server's writes.
+    with open(SERVER_LOG_PATH, "w") as log:
+        proc = subprocess.Popen(
+            SERVER_START_CMD,
+            stdout=log,
+            stderr=subprocess.STDOUT,
+            creationflags=subprocess.CREATE_NEW_PROCESS_GROUP if os.name == "nt" else 0,
+        )
 
-    deadline = time.time() + 12
-    while time.time() < deadline:
-        if _is_server_alive():
+    # Wait for the port to accept connections, backing off from 10ms; main()
+    # then confirms readiness with a single /health request.
+    parts = urlsplit(BASE_URL)
+    address = (parts.hostname or "127.0.0.1", parts.port or (443 if parts.scheme == "https" else 80))
+    delay = 0.01
+    deadline = time.monotonic() + 12
+    # A freshly spawned interpreter is never listening yet; skip the certain miss.
+    time.sleep(0.05)
+    while time.monotonic() < deadline and proc.poll() is None:
+        try:
+            socket.create_connection(address, timeout=0.5).close()
             return proc
-        time.sleep(0.35)
+        except OSError:
+            time.sleep(delay)
+            delay = min(delay * 1.7, 0.25)
 
     return proc
 
@@ -153,21 +240,77 @@ def _print_header() -> None:
 
 def _line(result: FeatureResult) -> str:
     pct = result.success_rate
-    ms = "-" if result.last_ms is None else f"{result.last_ms:.0f}ms"
-    label = result.stability_label
-    name = f"{result.name:<18}"
+    ms = "-" if result.last_ms is None else f"{result.last_ms}ms"
+    pct_txt = _c(f"{pct:6.1f}%", "32" if pct >= 90 else "33" if pct >= 70 else "31")
+    return (
+        f"{result.padded_name} {_bar(pct)} {pct_txt}  ok {result.ok}/{result.attempts}"
+        f"  last {ms}  stability: {result.stability_label}"
+    )
 
-    bar = _bar(pct)
-    pct_txt = f"{pct:6.1f}%"
 
-    if pct >= 90:
-        pct_txt = _c(pct_txt, "32")
-    elif pct >= 70:
-        pct_txt = _c(pct_txt, "33")
+def _probe_rounds_threaded(
+    features: List[Tuple[FeatureResult, partial]], on_round: RoundCallback, on_probe: Optional[ProbeCallback] = None
+) -> None:
+    """Run ATTEMPTS_PER_FEATURE rounds, probing every feature in parallel on threads."""
+    with ThreadPoolExecutor(max_workers=len(features)) as executor:
+        for _ in range(ATTEMPTS_PER_FEATURE):
+            futures = [executor.submit(fn) for _, fn in features]
+            if on_probe is not None:
+                for done, _ in enumerate(as_completed(futures), 1):
+                    on_probe(done)
+            on_round([fut.result() for fut in futures])
+
+
+async def _probe_rounds_async(
+    features: List[Tuple[FeatureResult, partial]], on_round: RoundCallback, on_probe: Optional[ProbeCallback] = None
+) -> None:
+    """Same rounds as _probe_rounds_threaded, multiplexed on one event loop with httpx."""
+    limits = httpx.Limits(max_keepalive_connections=16)
+    async with httpx.AsyncClient(base_url=BASE_URL, timeout=TIMEOUT_SECONDS, limits=limits) as client:
+        for _ in range(ATTEMPTS_PER_FEATURE):
+            done = 0
+
+            async def tracked(fn: partial) -> Tuple[bool, int, str]:
+                nonlocal done
+                outcome = await _arequest(client, *fn.args, **fn.keywords)
+                done += 1
+                if on_probe is not None:
+                    on_probe(done)
+                return outcome
+
+            outcomes = await asyncio.gather(*(tracked(fn) for _, fn in features))
+            on_round(list(outcomes))
+
+
+def _draw_progress(results: List[FeatureResult], step: int, total_steps: int, lines_printed: int) -> int:
+    """Draw one progress frame and return how many lines it occupies.
+
+    On a terminal the first frame clears the screen; later frames move the cursor
+    back over the previous one and overwrite it in a single write.
+    """
+    overall_pct = (step / total_steps) * 100.0
+    frame = [f"Overall: {_bar(overall_pct)} {overall_pct:5.1f}% ({step}/{total_steps})", "-"]
+    frame.extend(_line(r) for r in results)
+
+    if not _ANSI:
+        print("\n--- progress ---")
+        print("\n".join(frame))
+        return len(frame)
+
+    buf = io.StringIO()
+    if lines_printed:
+        buf.write(f"\x1b[{lines_printed}A")
     else:
-        pct_txt = _c(pct_txt, "31")
-
-    return f"{name} {bar} {pct_txt}  ok {result.ok}/{result.attempts}  last {ms}  stability: {label}"
+        sys.stdout.write("\x1b[2J\x1b[H")
+        _print_header()
+        buf.write(_c("Live progress:", "36") + "\n")
+    for text in frame:
+        buf.write(text + "\x1b[K\n")
+    # Wipe the per-probe status line left below the previous frame.
+    buf.write("\x1b[K")
+    sys.stdout.write(buf.getvalue())
+    sys.stdout.flush()
+    return len(frame)
 
 
 def main() -> int:
@@ -176,38 +319,43 @@ def main() -> int:
     server_proc = _start_server()
     if not _is_server_alive():
         print(_c("Server failed to start or is unreachable.", "31"))
-        if server_proc and server_proc.stdout:
+        if server_proc:
             try:
-                out = server_proc.stdout.read(2000)
+                with open(SERVER_LOG_PATH, "r", errors="replace") as log:
+                    out = log.read()[-2000:]
                 if out:
-                    print("--- server output (tail) ---")
+                    print(f"--- server output (tail of {SERVER_LOG_PATH}) ---")
                     print(out)
-            except Exception:
+            except OSError:
                 pass
         _stop_server(server_proc)
         return 2
 
     print(_c("Server is running. Starting feature tests...", "36"))
 
-    features: List[Tuple[FeatureResult, Callable[[], Tuple[bool, float, str]]]] = []
+    # Probes are partials of _request so the async path can replay their arguments.
+    features: List[Tuple[FeatureResult, partial]] = []
 
     health = FeatureResult("health")
-    features.append((health, lambda: _request("GET", "/health")))
+    features.append((health, partial(_request, "GET", "/health")))
 
     plugins = FeatureResult("list_plugins")
-    features.append((plugins, lambda: _request("GET", "/api/plugins")))
+    features.append((plugins, partial(_request, "GET", "/api/plugins")))
 
     info = FeatureResult("extract_info")
-    features.append((info, lambda: _request("POST", "/api/info", json_body={"url": TEST_INFO_URL})))
+    features.append((info, partial(_request, "POST", "/api/info", json_body={"url": TEST_INFO_URL})))
 
     batch = FeatureResult("batch_download")
     features.append(
         (
             batch,
-            lambda: _request(
+            partial(
+                _request,
                 "POST",
                 "/api/batch-download",
                 json_body={"series_url": TEST_SERIES_URL, "episodes": [1, 2]},
+                # Opt in to the streamed form so a truncated stream is caught.
+                headers={"Accept": "application/x-ndjson"},
             ),
         )
     )
@@ -218,7 +366,8 @@ def main() -> int:
         features.append(
             (
                 download,
-                lambda: _request(
+                partial(
+                    _request,
                     "POST",
                     "/api/download",
                     json_body={"url": TEST_DOWNLOAD_URL, "output_path": out_dir},
@@ -226,29 +375,29 @@ def main() -> int:
             )
         )
 
+    results = [r for r, _ in features]
     total_steps = ATTEMPTS_PER_FEATURE * len(features)
     step = 0
+    lines_printed = 0
+
+    def on_round(outcomes: List[Tuple[bool, int, str]]) -> None:
+        nonlocal step, lines_printed
+        for (result, _), (ok, ms, err) in zip(features, outcomes):
+            result.record(ok, ms, None if ok else err)
+        step += len(features)
+        lines_printed = _draw_progress(results, step, total_steps, lines_printed)
+
+    def on_probe(done: int) -> None:
+        # Between full frames, a single status line counts finished probes.
+        pct = ((step + done) / total_steps) * 100.0
+        sys.stdout.write(f"\r\x1b[K{pct:5.1f}%  {done}/{len(features)} probes done this round")
+        sys.stdout.flush()
 
     try:
-        for _ in range(ATTEMPTS_PER_FEATURE):
-            for result, fn in features:
-                ok, ms, err = fn()
-                result.record(ok, ms, None if ok else err)
-                step += 1
-
-                if _supports_ansi():
-                    sys.stdout.write("\x1b[2J\x1b[H")
-                    _print_header()
-                    print(_c("Live progress:", "36"))
-                else:
-                    print("\n--- progress ---")
-
-                overall_pct = (step / total_steps) * 100.0
-                print(f"Overall: {_bar(overall_pct)} {overall_pct:5.1f}% ({step}/{total_steps})")
-                print("-")
-                for r, _ in features:
-                    print(_line(r))
-                time.sleep(0.15)
+        if httpx is not None:
+            asyncio.run(_probe_rounds_async(features, on_round, on_probe if _ANSI else None))
+        else:
+            _probe_rounds_threaded(features, on_round, on_probe if _ANSI else None)
 
     finally:
         _stop_server(server_proc)
@@ -257,24 +406,17 @@ def main() -> int:
     print("Final Report")
     print("=" * 70)
 
-    overall_attempts = sum(r.attempts for r, _ in features)
-    overall_ok = sum(r.ok for r, _ in features)
+    overall_attempts = sum(r.attempts for r in results)
+    overall_ok = sum(r.ok for r in results)
     overall_rate = (overall_ok / overall_attempts) * 100.0 if overall_attempts else 0.0
 
     print(f"Overall success rate: {overall_rate:.1f}% ({overall_ok}/{overall_attempts})")
     print("-")
 
-    for r, _ in features:
+    for r in results:
         print(_line(r))
-        if r.errors:
-            uniq: List[str] = []
-            for e in r.errors:
-                if e not in uniq:
-                    uniq.append(e)
-                if len(uniq) >= 2:
-                    break
-            for e in uniq:
-                print(f"  - last error: {e}")
+        for e in list(dict.fromkeys(r.errors))[:2]:
+            print(f"  - last error: {e}")
 
     print("=")
     print("Notes:")
@@ -4,11 +4,16 @@
 from __future__ import annotations
 
 import os
+import select
+import shutil
 import sys
 import time
-from typing import Any, Dict, Optional
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from itertools import islice
+from typing import Any, Dict, List, Optional
 
-from app.plugin_manager import PluginManager
+from app.plugin_manager import PLUGIN_MANAGER
 
 
 def _optional_imports():
@@ -46,33 +51,285 @@ def _optional_imports():
 
 Fore, Style, questionary, custom_style = _optional_imports()
 
+# Rows left free below a frame for prompts; if a screen may have scrolled past
+# this, the next frame repaints every row instead of trusting the old one.
+PROMPT_RESERVE_ROWS = 10
+
+AUTO_TEST_URLS = (
+    "https://gogoanime.io/one-piece-episode-1075",
+    "https://hianime.to/watch/jujutsu-kaisen-534?ep=1234",
+    "https://www.youtube.com/watch?v=dQw4w9WgXcQ",
+)
+AUTO_TEST_WORKERS = 8
+EPISODE_PREVIEW_COUNT = 10
+TEST_DOWNLOAD_DIR = "./test_downloads"
+
+MAIN_MENU_CHOICES = (
+    "Self Test - System Health Check",
+    "Test Download - Test URL Download",
+    "Plugin Status - View Loaded Plugins",
+    "Quick Test - Run Predefined Tests",
+    "View Results - Show Previous Test Results",
+    "Exit",
+)
+TEST_MODE_CHOICES = ("Auto (Use predefined test URLs)", "Custom (Enter your own URL)")
+DOWNLOAD_TYPE_CHOICES = ("Single Episode (This URL only)", "Just test info extraction (No download)")
+QUALITY_CHOICES = ("1080", "720", "480", "360", "best")
+FORMAT_CHOICES = ("bestvideo+bestaudio/best", "best")
+
+# Prompt factories: a questionary Question keeps its answered state, so each
+# ask needs a fresh one, but the arguments only have to be assembled once.
+if questionary:
+    _ask_menu = partial(questionary.select, "Select an option:", choices=MAIN_MENU_CHOICES, style=custom_style)
+    _ask_test_mode = partial(questionary.select, "Select test mode:", choices=TEST_MODE_CHOICES, style=custom_style)
+    _ask_download_type = partial(
+        questionary.select, "What do you want to do?", choices=DOWNLOAD_TYPE_CHOICES, style=custom_style
+    )
+    _ask_quality = partial(questionary.select, "Select quality:", choices=QUALITY_CHOICES, style=custom_style)
+    _ask_format = partial(questionary.select, "Select format:", choices=FORMAT_CHOICES, style=custom_style)
+    _ask_dry_run = partial(questionary.confirm, "Dry run (no download)?", default=True)
+
+_RULE = "=" * 60
+if Fore and Style:
+    _HEADER = (
+        f"{Fore.CYAN}{_RULE}\n"
+        f"{Fore.CYAN}  ANIME DOWNLOADER - TEST SUITE\n"
+        f"{Fore.CYAN}{_RULE}{Style.RESET_ALL}\n\n"
+    )
+else:
+    _HEADER = f"{_RULE}\n  ANIME DOWNLOADER - TEST SUITE\n{_RULE}\n\n"
+
+# (expected SITE_NAME substring, url) pairs checked by self_test and quick_test.
+SELF_TEST_URLS = (
+    ("gogo", "https://gogoanime.io/test-episode-1"),
+    ("hianime", "https://hianime.to/watch/test"),
+    ("generic", "https://example.com/video"),
+)
+QUICK_TEST_CASES = (
+    ("GogoAnime", "https://gogoanime.io/naruto-episode-220"),
+    ("HiAnime", "https://hianime.to/watch/one-piece-100?ep=12345"),
+    ("9anime", "https://9anime.to/watch/attack-on-titan.123/ep-75"),
+    ("Generic", "https://example.com/some-video"),
+)
+
+_HIDE_CURSOR = "\x1b[?25l"
+_SHOW_CURSOR = "\x1b[?25h"
+_CLEAR_SCREEN = "\x1b[H\x1b[2J"
+_ENABLE_VIRTUAL_TERMINAL_PROCESSING = 0x0004
+
+
+def _enable_windows_vt() -> None:
+    """Let a Windows 10+ console interpret the ANSI sequences the screen buffer emits."""
+    try:
+        import ctypes
+
+        kernel32 = ctypes.windll.kernel32  # type: ignore[attr-defined]
+        handle = kernel32.GetStdHandle(-11)  # STD_OUTPUT_HANDLE
+        mode = ctypes.c_uint32()
+        if kernel32.GetConsoleMode(handle, ctypes.byref(mode)):
+            kernel32.SetConsoleMode(handle, mode.value | _ENABLE_VIRTUAL_TERMINAL_PROCESSING)
+    except Exception:
+        pass
+
+
+_YTDLP_AVAILABLE: Optional[bool] = None
+
+
+def _have_ytdlp() -> bool:
+    """Import yt_dlp on first use and remember the outcome, including failure."""
+    global _YTDLP_AVAILABLE
+    if _YTDLP_AVAILABLE is None:
+        try:
+            import yt_dlp  # noqa: F401
+
+            _YTDLP_AVAILABLE = True
+        except Exception:
+            _YTDLP_AVAILABLE = False
+    return _YTDLP_AVAILABLE
+
+
+def _episode_line(ep: Dict[str, Any]) -> str:
+    line = f"  - EP {ep.get('episode') or ep.get('episode_number') or '?'}"
+    if ep.get("title"):
+        line += f": {ep['title']}"
+    if ep.get("url"):
+        line += f" | {ep['url']}"
+    return line
+
+
+def _write_fd(fd: int, data: bytes) -> None:
+    """Write all of ``data`` to ``fd`` with raw os.write calls, bypassing TextIOWrapper."""
+    view = memoryview(data)
+    while view:
+        try:
+            written = os.write(fd, view)
+        except BlockingIOError:
+            select.select([], [fd], [])
+            continue
+        view = view[written:]
+
+
+def _read_key() -> None:
+    """Block until a single key is pressed; no Enter needed on a terminal."""
+    if not sys.stdin.isatty():
+        sys.stdin.readline()
+        return
+    if os.name == "nt":
+        import msvcrt
+
+        msvcrt.getwch()
+        return
+
+    import termios
+    import tty
+
+    fd = sys.stdin.fileno()
+    saved = termios.tcgetattr(fd)
+    try:
+        # cbreak keeps ISIG, so Ctrl+C still raises KeyboardInterrupt here.
+        tty.setcbreak(fd)
+        # Arrow and function keys arrive as one multi-byte burst; take it whole.
+        os.read(fd, 32)
+    finally:
+        termios.tcsetattr(fd, termios.TCSADRAIN, saved)
+
+
+class ScreenBuffer:
+    """Line-diffing renderer for the menu screens.
+
+    The first flush after ``reset_to_blank`` paints the frame from the top of
+    the screen, rewriting only rows that differ from the previous frame and
+    clearing whatever is left below. Later flushes in the same frame append at
+    the cursor, so prompts and progress output keep their place. When stdout is
+    not a terminal the text is written as-is.
+    """
+
+    def __init__(self) -> None:
+        self._prev: List[str] = []
+        self._pending: List[str] = []
+        self._repaint = False
+        self._rows_used = 0
+
+    def reset_to_blank(self) -> None:
+        """Start a new frame; nothing is written until the next flush."""
+        self._pending.clear()
+        self._repaint = True
+        if self._rows_used + PROMPT_RESERVE_ROWS >= shutil.get_terminal_size().lines:
+            self._prev = []
+        self._rows_used = 0
+
+    def put(self, text: str) -> None:
+        self._pending.append(text)
+
+    def flush(self) -> None:
+        text = "".join(self._pending)
+        self._pending.clear()
+        if not text and not self._repaint:
+            return
+
+        lines = text.split("\n")
+        cols = max(1, shutil.get_terminal_size().columns)
+        self._rows_used += sum(len(line) // cols for line in lines) + len(lines) - 1
+
+        stream = sys.stdout
+        if not stream.isatty():
+            self._repaint = False
+            stream.write(text)
+            stream.flush()
+            return
+
+        if self._repaint:
+            # The last element is the unterminated tail (usually empty); it is
+            # written after the clear so the cursor ends up right behind it.
+            tail = lines.pop()
+            out = [_HIDE_CURSOR]
+            prev = self._prev
+            if not prev:
+                out.append(_CLEAR_SCREEN)
+            for row, line in enumerate(lines):
+                if row < len(prev) and prev[row] == line:
+                    continue
+                out.append(f"\x1b[{row + 1};1H{line}\x1b[K")
+            out.append(f"\x1b[{len(lines) + 1};1H\x1b[J{tail}{_SHOW_CURSOR}")
+            self._prev = lines
+            self._repaint = False
+            text = "".join(out)
+
+        if os.name == "nt":
+            # Windows consoles (and colorama's wrapper) need the text layer.
+            stream.write(text)
+            stream.flush()
+            return
+        # Anything print() or input() left in the text buffer must land first.
+        stream.flush()
+        _write_fd(stream.fileno(), text.encode(stream.encoding or "utf-8", "replace"))
+
 
 class AnimeDownloaderTestApp:
     def __init__(self):
-        self.plugin_manager = PluginManager()
-        self.test_results = []
+        self.plugin_manager = PLUGIN_MANAGER
+        # Test history kept as parallel columns, the only fields view_results shows.
+        self._result_times: List[str] = []
+        self._result_urls: List[str] = []
+        self._result_statuses: List[str] = []
+        self.screen = ScreenBuffer()
+        self._plugins: Optional[List[Dict[str, Any]]] = None
+        self._out_dir_ready = False
+        self._site_names: Dict[int, str] = {}
+        # Menu labels and their 1-based numbers map straight to handlers; the
+        # labels' leading keywords ("Self Test", ...) cover free-typed input.
+        handlers = (
+            self.self_test,
+            self.test_download,
+            self.plugin_status,
+            self.quick_test,
+            self.view_results,
+            self._exit,
+        )
+        self._menu_actions = dict(zip(MAIN_MENU_CHOICES, handlers))
+        self._menu_actions.update((str(idx), h) for idx, h in enumerate(handlers, 1))
+        self._menu_keywords = {label.split(" - ")[0]: h for label, h in zip(MAIN_MENU_CHOICES, handlers)}
+        if os.name == "nt" and Fore is None:
+            # colorama translates escapes itself; without it the console must do it.
+            _enable_windows_vt()
+
+    def _emit(self, text: str = "", end: str = "\n") -> None:
+        self.screen.put(text + end)
+
+    def _commit(self) -> None:
+        self.screen.flush()
+
+    def _out(self, text: str = "", end: str = "\n") -> None:
+        self._emit(text, end)
+        self._commit()
+
+    def _pause(self, prompt: str = "Press any key to return to menu...") -> None:
+        self._emit(prompt, end="")
+        self._commit()
+        _read_key()
+        self._out()
+
+    def _list_plugins(self) -> List[Dict[str, Any]]:
+        # The manager loads its plugins once per process, so one listing serves every screen.
+        if self._plugins is None:
+            self._plugins = self.plugin_manager.list_plugins()
+        return self._plugins
 
     def clear_screen(self):
-        os.system("cls" if os.name == "nt" else "clear")
+        self.screen.reset_to_blank()
 
     def print_header(self):
         self.clear_screen()
-        if Fore and Style:
-            print(f"{Fore.CYAN}{'='*60}")
-            print(f"{Fore.CYAN}  ANIME DOWNLOADER - TEST SUITE")
-            print(f"{Fore.CYAN}{'='*60}{Style.RESET_ALL}\n")
-        else:
-            print("=" * 60)
-            print("  ANIME DOWNLOADER - TEST SUITE")
-            print("=" * 60 + "\n")
+        self.screen.put(_HEADER)
+        self.screen.flush()
 
     def _warn_missing_deps(self):
         if questionary is None or Fore is None:
-            print("Interactive UI dependencies are missing.")
-            print("Install them for the full terminal UI experience:")
-            print("  pip install questionary colorama")
-            print("\nContinuing with basic text prompts...\n")
-            input("Press Enter to continue...")
+            self._out("Interactive UI dependencies are missing.")
+            self._out("Install them for the full terminal UI experience:")
+            self._out("  pip install questionary colorama")
+            self._out("\nContinuing with basic text prompts...\n")
+            self._pause("Press any key to continue...")
 
     def main_menu(self):
         self._warn_missing_deps()
@@ -81,120 +338,112 @@ class AnimeDownloaderTestApp:
             self.print_header()
 
             if questionary:
-                choice = questionary.select(
-                    "Select an option:",
-                    choices=[
-                        "Self Test - System Health Check",
-                        "Test Download - Test URL Download",
-                        "Plugin Status - View Loaded Plugins",
-                        "Quick Test - Run Predefined Tests",
-                        "View Results - Show Previous Test Results",
-                        "Exit",
-                    ],
-                    style=custom_style,
-                ).ask()
+                choice = _ask_menu().ask()
             else:
-                print("1) Self Test - System Health Check")
-                print("2) Test Download - Test URL Download")
-                print("3) Plugin Status - View Loaded Plugins")
-                print("4) Quick Test - Run Predefined Tests")
-                print("5) View Results - Show Previous Test Results")
-                print("6) Exit")
+                for idx, label in enumerate(MAIN_MENU_CHOICES, 1):
+                    self._emit(f"{idx}) {label}")
+                self._commit()
                 choice = input("Select option: ").strip()
 
-            if not choice or "Exit" in choice or choice == "6":
-                print("\nGoodbye!")
-                sys.exit(0)
-            if "Self Test" in choice or choice == "1":
-                self.self_test()
-            elif "Test Download" in choice or choice == "2":
-                self.test_download()
-            elif "Plugin Status" in choice or choice == "3":
-                self.plugin_status()
-            elif "Quick Test" in choice or choice == "4":
-                self.quick_test()
-            elif "View Results" in choice or choice == "5":
-                self.view_results()
+            if not choice:
+                self._exit()
+            handler = self._menu_actions.get(choice)
+            if handler is None:
+                # Typed text such as "Quick Test" still selects by keyword.
+                handler = next((h for k, h in self._menu_keywords.items() if k in choice), None)
+            if handler is not None:
+                handler()
+
+    def _exit(self):
+        self._out("\nGoodbye!")
+        sys.exit(0)
 
     def self_test(self):
         self.print_header()
-        print("Running Self Test...\n")
+        self._emit("Running Self Test...\n")
 
         tests = []
 
-        print("[1/5] Testing plugin loading...", end="")
-        plugins = self.plugin_manager.list_plugins()
+        self._emit("[1/5] Testing plugin loading...", end="")
+        plugins = self._list_plugins()
         if len(plugins) > 0:
-            print(f" PASS ({len(plugins)} plugins loaded)")
+            self._emit(f" PASS ({len(plugins)} plugins loaded)")
             tests.append(True)
         else:
-            print(" FAIL (No plugins loaded)")
+            self._emit(" FAIL (No plugins loaded)")
             tests.append(False)
 
-        print("[2/5] Checking fallback plugin...", end="")
-        fallback = [p for p in plugins if p.get("is_fallback")]
+        self._emit("[2/5] Checking fallback plugin...", end="")
+        fallback = next((p for p in plugins if p.get("is_fallback")), None)
         if fallback:
-            print(f" PASS ({fallback[0].get('name')})")
+            self._emit(f" PASS ({fallback.get('name')})")
             tests.append(True)
         else:
-            print(" FAIL (No fallback plugin)")
+            self._emit(" FAIL (No fallback plugin)")
             tests.append(False)
 
-        print("[3/5] Checking yt-dlp (python import)...", end="")
-        try:
-            import yt_dlp  # noqa: F401
-
-            print(" PASS")
+        self._emit("[3/5] Checking yt-dlp (python import)...", end="")
+        if _have_ytdlp():
+            self._emit(" PASS")
             tests.append(True)
-        except Exception:
-            print(" FAIL (yt_dlp import failed)")
+        else:
+            self._emit(" FAIL (yt_dlp import failed)")
             tests.append(False)
 
-        print("[4/5] Checking download directory...", end="")
-        download_dir = "./test_downloads"
-        os.makedirs(download_dir, exist_ok=True)
-        if os.path.exists(download_dir) and os.access(download_dir, os.W_OK):
-            print(f" PASS ({download_dir})")
-            tests.append(True)
-        else:
-            print(f" FAIL (Cannot write to {download_dir})")
+        self._emit("[4/5] Checking download directory...", end="")
+        download_dir = TEST_DOWNLOAD_DIR
+        try:
+            # Creating and removing a file proves writability in one round trip.
+            os.makedirs(download_dir, exist_ok=True)
+            probe = os.path.join(download_dir, ".write-test")
+            with open(probe, "wb"):
+                pass
+            os.unlink(probe)
+        except OSError as e:
+            self._out_dir_ready = False
+            self._emit(f" FAIL (Cannot write to {download_dir}: {e})")
             tests.append(False)
+        else:
+            self._out_dir_ready = True
+            self._emit(f" PASS ({download_dir})")
+            tests.append(True)
 
-        print("[5/5] Testing URL pattern matching...", end="")
-        test_urls = {
-            "https://gogoanime.io/test-episode-1": "gogo",
-            "https://hianime.to/watch/test": "hianime",
-            "https://example.com/video": "generic",
-        }
-        matched = 0
-        for url, expected in test_urls.items():
-            plugin = self.plugin_manager.get_plugin_for_url(url)
-            if expected in plugin.SITE_NAME.lower():
-                matched += 1
+        self._emit("[5/5] Testing URL pattern matching...", end="")
+        matched = sum(1 for _, _, _, ok in self._match_cases(SELF_TEST_URLS) if ok)
 
-        if matched == len(test_urls):
-            print(f" PASS ({matched}/{len(test_urls)} matched)")
+        if matched == len(SELF_TEST_URLS):
+            self._emit(f" PASS ({matched}/{len(SELF_TEST_URLS)} matched)")
             tests.append(True)
         else:
-            print(f" PARTIAL ({matched}/{len(test_urls)} matched)")
+            self._emit(f" PARTIAL ({matched}/{len(SELF_TEST_URLS)} matched)")
             tests.append(False)
 
-        passed = sum(1 for t in tests if t)
+        passed = sum(tests)
         total = len(tests)
-        print("\n" + ("=" * 60))
-        print(f"Result: {passed}/{total} passed")
-        print(("=" * 60))
-        input("Press Enter to return to menu...")
+        self._emit("\n" + _RULE)
+        self._emit(f"Result: {passed}/{total} passed")
+        self._emit(_RULE)
+        self._pause()
+
+    def _match_cases(self, cases):
+        """Yield ``(expected, url, plugin, matched)`` for each ``(expected, url)`` case."""
+        get_plugin = self.plugin_manager.get_plugin_for_url
+        for expected, url in cases:
+            plugin = get_plugin(url)
+            yield expected, url, plugin, expected.lower() in self._site_lower(plugin)
+
+    def _site_lower(self, plugin: Any) -> str:
+        # Plugin instances live as long as the manager, so their id is a stable key.
+        name = self._site_names.get(id(plugin))
+        if name is None:
+            name = self._site_names[id(plugin)] = plugin.SITE_NAME.lower()
+        return name
 
     def test_download(self):
         self.print_header()
 
         if questionary:
-            mode = questionary.select(
-                "Select test mode:",
-                choices=["Auto (Use predefined test URLs)", "Custom (Enter your own URL)"],
-                style=custom_style,
-            ).ask()
+            mode = _ask_test_mode().ask()
         else:
             mode = input("Mode (auto/custom): ").strip().lower()
             mode = "Auto" if mode.startswith("a") else "Custom"
@@ -207,23 +456,28 @@ class AnimeDownloaderTestApp:
         else:
             self._custom_test_download()
 
+    def _probe(self, url: str):
+        started = time.perf_counter_ns()
+        plugin = self.plugin_manager.get_plugin_for_url(url)
+        info = self.plugin_manager.extract_info(url)
+        return plugin, info, time.perf_counter_ns() - started
+
     def _auto_test_download(self):
-        test_urls = [
-            "https://gogoanime.io/one-piece-episode-1075",
-            "https://hianime.to/watch/jujutsu-kaisen-534?ep=1234",
-            "https://www.youtube.com/watch?v=dQw4w9WgXcQ",
-        ]
+        test_urls = AUTO_TEST_URLS
 
-        print(f"\nRunning auto tests with {len(test_urls)} URLs...\n")
-        for idx, url in enumerate(test_urls, 1):
-            print(f"Test {idx}/{len(test_urls)}: {url}")
-            self._run_test(url, auto=True)
-            print()
+        self._out(f"\nRunning auto tests with {len(test_urls)} URLs...\n")
+        # Extraction is network-bound, so fetch every URL at once and report in order.
+        with ThreadPoolExecutor(max_workers=min(AUTO_TEST_WORKERS, len(test_urls))) as pool:
+            probes = pool.map(self._probe, test_urls)
+            for idx, (url, (plugin, info, probe_ns)) in enumerate(zip(test_urls, probes), 1):
+                self._out(f"Test {idx}/{len(test_urls)}: {url}")
+                self._run_test(url, auto=True, plugin=plugin, info=info, probe_ns=probe_ns)
+                self._out()
 
-        input("Press Enter to return to menu...")
+        self._pause()
 
     def _custom_test_download(self):
-        print("\nCustom Test Mode\n")
+        self._out("\nCustom Test Mode\n")
 
         if questionary:
             url = questionary.text(
@@ -239,21 +493,14 @@ class AnimeDownloaderTestApp:
         info = self.plugin_manager.extract_info(url)
         plugin = self.plugin_manager.get_plugin_for_url(url)
 
-        print("\nDetected Information:")
-        print(f"  - Website: {plugin.SITE_NAME}")
-        print(f"  - Title: {info.get('title', 'Unknown')}")
+        self._out("\nDetected Information:")
+        self._out(f"  - Website: {plugin.SITE_NAME}")
+        self._out(f"  - Title: {info.get('title', 'Unknown')}")
         if info.get("episode"):
-            print(f"  - Episode: {info.get('episode')}")
+            self._out(f"  - Episode: {info.get('episode')}")
 
         if questionary:
-            download_type = questionary.select(
-                "What do you want to do?",
-                choices=[
-                    "Single Episode (This URL only)",
-                    "Just test info extraction (No download)",
-                ],
-                style=custom_style,
-            ).ask()
+            download_type = _ask_download_type().ask()
         else:
             download_type = input("Action (download/info): ").strip().lower()
             download_type = "Just test" if download_type.startswith("i") else "Single"
@@ -263,50 +510,55 @@ class AnimeDownloaderTestApp:
 
         if "Just test" in download_type:
             self._display_info_only(url, info, plugin)
-            input("\nPress Enter to return to menu...")
+            self._pause("\nPress any key to return to menu...")
             return
 
         if questionary:
-            quality = questionary.select(
-                "Select quality:",
-                choices=["1080", "720", "480", "360", "best"],
-                style=custom_style,
-            ).ask()
+            quality = _ask_quality().ask()
         else:
             quality = input("Quality (1080/720/480/360/best): ").strip() or "best"
 
         if questionary:
-            fmt = questionary.select(
-                "Select format:",
-                choices=["bestvideo+bestaudio/best", "best"],
-                style=custom_style,
-            ).ask()
+            fmt = _ask_format().ask()
         else:
             fmt = input("Format (default bestvideo+bestaudio/best): ").strip() or "bestvideo+bestaudio/best"
 
         dry_run = True
         if questionary:
-            dry_run = questionary.confirm("Dry run (no download)?", default=True).ask()
+            dry_run = _ask_dry_run().ask()
         else:
             dry_run = (input("Dry run? (y/n): ").strip().lower() or "y") in {"y", "yes"}
 
         cfg = {"quality": quality, "format": fmt, "dry_run": dry_run}
-        self._run_test(url, auto=False, config=cfg)
-        input("\nPress Enter to return to menu...")
-
-    def _run_test(self, url: str, auto: bool = False, config: Optional[Dict[str, Any]] = None):
-        start_time = time.time()
-
-        plugin = self.plugin_manager.get_plugin_for_url(url)
-        info = self.plugin_manager.extract_info(url)
+        self._run_test(url, auto=False, config=cfg, plugin=plugin, info=info)
+        self._pause("\nPress any key to return to menu...")
+
+    def _run_test(
+        self,
+        url: str,
+        auto: bool = False,
+        config: Optional[Dict[str, Any]] = None,
+        plugin: Any = None,
+        info: Optional[Dict[str, Any]] = None,
+        probe_ns: int = 0,
+    ):
+        # probe_ns is time the caller already spent resolving plugin/info for this URL;
+        # it is measured where the probe ran, so queueing behind other probes doesn't count.
+        start_ns = time.perf_counter_ns()
+
+        # Callers that already resolved the URL pass plugin/info to skip a second extraction.
+        if plugin is None:
+            plugin = self.plugin_manager.get_plugin_for_url(url)
+        if info is None:
+            info = self.plugin_manager.extract_info(url)
 
-        print(f"Plugin: {plugin.SITE_NAME}")
-        print(f"URL: {url}")
+        self._emit(f"Plugin: {plugin.SITE_NAME}")
+        self._emit(f"URL: {url}")
 
         if auto:
             for k, v in info.items():
                 if v and k != "error":
-                    print(f"  - {k}: {v}")
+                    self._emit(f"  - {k}: {v}")
 
             result = {
                 "website": plugin.SITE_NAME,
@@ -317,14 +569,16 @@ class AnimeDownloaderTestApp:
         else:
             config = config or {}
             dry_run = bool(config.get("dry_run", True))
-            out_dir = "./test_downloads"
-            os.makedirs(out_dir, exist_ok=True)
+            out_dir = TEST_DOWNLOAD_DIR
+            if not self._out_dir_ready:
+                os.makedirs(out_dir, exist_ok=True)
+                self._out_dir_ready = True
 
-            print("\nConfiguration:")
-            print(f"  - Quality: {config.get('quality', 'best')}")
-            print(f"  - Format: {config.get('format', 'bestvideo+bestaudio/best')}")
-            print(f"  - Output: {out_dir}")
-            print(f"  - Dry run: {dry_run}")
+            self._emit("\nConfiguration:")
+            self._emit(f"  - Quality: {config.get('quality', 'best')}")
+            self._emit(f"  - Format: {config.get('format', 'bestvideo+bestaudio/best')}")
+            self._emit(f"  - Output: {out_dir}")
+            self._emit(f"  - Dry run: {dry_run}")
 
             if dry_run:
                 result = {
@@ -335,6 +589,8 @@ class AnimeDownloaderTestApp:
                     "config": config,
                 }
             else:
+                # Show the configuration before the (slow) download starts.
+                self._commit()
                 dl = self.plugin_manager.download(
                     url,
                     out_dir,
@@ -351,44 +607,41 @@ class AnimeDownloaderTestApp:
                     "config": config,
                 }
 
-        elapsed = time.time() - start_time
-        print("\n" + ("=" * 60))
-        print("TEST RESULTS")
-        print(("=" * 60))
-        print(f"Website: {result.get('website')}")
-        print(f"Anime Name: {result.get('anime_name')}")
-        print(f"Episode: {result.get('episode', 'N/A')}")
-        print(f"Status: {result.get('status')}")
-        print(f"Time Elapsed: {elapsed:.2f}s")
+        elapsed_ms = (probe_ns + time.perf_counter_ns() - start_ns) // 1_000_000
+        self._emit("\n" + _RULE)
+        self._emit("TEST RESULTS")
+        self._emit(_RULE)
+        self._emit(f"Website: {result.get('website')}")
+        self._emit(f"Anime Name: {result.get('anime_name')}")
+        self._emit(f"Episode: {result.get('episode', 'N/A')}")
+        self._emit(f"Status: {result.get('status')}")
+        self._emit(f"Time Elapsed: {elapsed_ms // 1000}.{elapsed_ms % 1000 // 10:02d}s")
         if result.get("download"):
-            print(f"Download Success: {result['download'].get('success')}")
+            self._emit(f"Download Success: {result['download'].get('success')}")
             if result["download"].get("error"):
-                print(f"Download Error: {result['download'].get('error')}")
-        print(("=" * 60))
-
-        self.test_results.append(
-            {
-                "timestamp": time.strftime("%Y-%m-%d %H:%M:%S"),
-                "url": url,
-                "result": result,
-            }
-        )
+                self._emit(f"Download Error: {result['download'].get('error')}")
+        self._emit(_RULE)
+        self._commit()
+
+        self._result_times.append(time.strftime("%Y-%m-%d %H:%M:%S"))
+        self._result_urls.append(url)
+        self._result_statuses.append(result.get("status", "Unknown"))
 
     def _display_info_only(self, url: str, info: Dict[str, Any], plugin: Any):
-        print("\n" + ("=" * 60))
-        print("EXTRACTED INFORMATION")
-        print(("=" * 60))
-        print(f"Website: {plugin.SITE_NAME}")
-        print(f"Title: {info.get('title', 'Unknown')}")
-        print(f"Episode: {info.get('episode', 'N/A')}")
+        self._emit("\n" + _RULE)
+        self._emit("EXTRACTED INFORMATION")
+        self._emit(_RULE)
+        self._emit(f"Website: {plugin.SITE_NAME}")
+        self._emit(f"Title: {info.get('title', 'Unknown')}")
+        self._emit(f"Episode: {info.get('episode', 'N/A')}")
         if info.get("total_episodes") is not None:
-            print(f"Total Episodes: {info.get('total_episodes')}")
+            self._emit(f"Total Episodes: {info.get('total_episodes')}")
         if info.get("expected_total_episodes") is not None:
-            print(f"Expected Total Episodes: {info.get('expected_total_episodes')}")
+            self._emit(f"Expected Total Episodes: {info.get('expected_total_episodes')}")
 
         seasons = info.get("seasons") or []
         if isinstance(seasons, list) and seasons:
-            print("\nSeasons:")
+            self._emit("\nSeasons:")
             for s in seasons:
                 s_num = s.get("season_number")
                 s_name = s.get("season_name") or (f"Season {s_num}" if s_num else "Season")
@@ -397,87 +650,74 @@ class AnimeDownloaderTestApp:
                     eps_count = len(eps) if isinstance(eps, list) else 0
                 except Exception:
                     eps_count = 0
-                print(f"  - {s_name} ({eps_count} episodes)")
+                self._emit(f"  - {s_name} ({eps_count} episodes)")
 
             # show a small preview list of episode URLs
             first_season = seasons[0]
             eps_preview = first_season.get("episodes") or []
             if isinstance(eps_preview, list) and eps_preview:
-                print("\nEpisodes (preview):")
-                for ep in eps_preview[:10]:
-                    ep_no = ep.get("episode") or ep.get("episode_number") or "?"
-                    ep_title = ep.get("title") or ""
-                    ep_url = ep.get("url") or ""
-                    line = f"  - EP {ep_no}"
-                    if ep_title:
-                        line += f": {ep_title}"
-                    if ep_url:
-                        line += f" | {ep_url}"
-                    print(line)
-                if len(eps_preview) > 10:
-                    print(f"  ... and {len(eps_preview) - 10} more")
-
-        print(f"URL: {url}")
-        print(("=" * 60))
+                preview = "\n".join(map(_episode_line, islice(eps_preview, EPISODE_PREVIEW_COUNT)))
+                self._emit(f"\nEpisodes (preview):\n{preview}")
+                if len(eps_preview) > EPISODE_PREVIEW_COUNT:
+                    self._emit(f"  ... and {len(eps_preview) - EPISODE_PREVIEW_COUNT} more")
+
+        self._emit(f"URL: {url}")
+        self._emit(_RULE)
+        self._commit()
 
     def plugin_status(self):
         self.print_header()
 
-        plugins = self.plugin_manager.list_plugins()
-        print(f"Loaded Plugins: {len(plugins)}\n")
+        plugins = self._list_plugins()
+        self._emit(f"Loaded Plugins: {len(plugins)}\n")
 
         for idx, p in enumerate(plugins, 1):
             is_fallback = p.get("is_fallback", False)
-            print(f"{idx}. {p.get('name')}")
-            print(f"   Priority: {p.get('priority')}")
-            print(f"   Type: {'Fallback' if is_fallback else 'Site-specific'}")
+            self._emit(f"{idx}. {p.get('name')}")
+            self._emit(f"   Priority: {p.get('priority')}")
+            self._emit(f"   Type: {'Fallback' if is_fallback else 'Site-specific'}")
             patterns = p.get("patterns") or []
             if is_fallback:
-                print("   Patterns: Matches all URLs")
+                self._emit("   Patterns: Matches all URLs")
             else:
-                print(f"   Patterns: {len(patterns)}")
-            print()
+                self._emit(f"   Patterns: {len(patterns)}")
+            self._emit()
 
-        input("Press Enter to return to menu...")
+        self._pause()
 
     def quick_test(self):
         self.print_header()
 
-        print("Quick Test Suite\n")
-        test_cases = [
-            ("GogoAnime", "https://gogoanime.io/naruto-episode-220"),
-            ("HiAnime", "https://hianime.to/watch/one-piece-100?ep=12345"),
-            ("9anime", "https://9anime.to/watch/attack-on-titan.123/ep-75"),
-            ("Generic", "https://example.com/some-video"),
-        ]
+        self._emit("Quick Test Suite\n")
 
         passed = 0
-        for expected, url in test_cases:
-            plugin = self.plugin_manager.get_plugin_for_url(url)
-            matched = expected.lower() in plugin.SITE_NAME.lower()
-            passed += 1 if matched else 0
-            print(f"{'PASS' if matched else 'FAIL'} {expected}: {url}")
-            print(f"  Matched to: {plugin.SITE_NAME}\n")
+        for expected, url, plugin, matched in self._match_cases(QUICK_TEST_CASES):
+            passed += matched
+            self._emit(f"{'PASS' if matched else 'FAIL'} {expected}: {url}")
+            self._emit(f"  Matched to: {plugin.SITE_NAME}\n")
 
-        print(f"Results: {passed}/{len(test_cases)} passed")
-        input("\nPress Enter to return to menu...")
+        self._emit(f"Results: {passed}/{len(QUICK_TEST_CASES)} passed")
+        self._pause("\nPress any key to return to menu...")
 
     def view_results(self):
         self.print_header()
 
-        if not self.test_results:
-            print("No test results available yet.\n")
-            input("Press Enter to return to menu...")
+        if not self._result_times:
+            self._emit("No test results available yet.\n")
+            self._pause()
             return
 
-        print(f"Previous Test Results ({len(self.test_results)})\n")
-        for idx, test in enumerate(self.test_results, 1):
-            status = test["result"].get("status", "Unknown")
-            print(f"{idx}. {test['timestamp']}")
-            print(f"   URL: {test['url']}")
-            print(f"   Status: {status}\n")
+        self._emit(f"Previous Test Results ({len(self._result_times)})\n")
+        self._emit(
+            "\n".join(
+                f"{idx}. {ts}\n   URL: {url}\n   Status: {status}\n"
+                for idx, (ts, url, status) in enumerate(
+                    zip(self._result_times, self._result_urls, self._result_statuses), 1
+                )
+            )
+        )
 
-        input("Press Enter to return to menu...")
+        self._pause()
 
 
 def main() -> None: